@@ -0,0 +1,142 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from grade_scales import (BELOW, EXCEEDING, GRADE_POINTS, GRADE_SCALES, MEETING, SAME_GRADE, STATUS_TABLE,
+                          UNKNOWN_CODE, compare_codes, grade_code)
+
+# Priority levels, lowest first
+PRIORITY_LOW, PRIORITY_MEDIUM, PRIORITY_HIGH = range(3)
+PRIORITY_NAMES = ('low', 'medium', 'high')
+
+# Subjects below target that make a student medium / high priority
+MEDIUM_PRIORITY_BELOW = 1
+HIGH_PRIORITY_BELOW = 3
+
+_STATUS_TABLE = np.array(STATUS_TABLE, dtype=np.int8)
+_GRADE_POINTS = np.array(GRADE_POINTS, dtype=np.int8)
+_GRADE_SCALES = np.array(GRADE_SCALES, dtype=np.int8)
+
+class GradeAnalysis:
+    """Current-vs-target classification of standardized data, held as flat per-subject arrays"""
+    
+    def __init__(self, standardized_data: List[Dict]):
+        # Students without any subjects are left out of the analysis
+        self.students = [student for student in standardized_data if student['subjects']]
+        self._flatten()
+        self._classify()
+    
+    def _flatten(self):
+        """One array entry per (student, subject), in student then subject order"""
+        subject_ids = {}
+        codes = {}
+        student_index = []
+        subject_index = []
+        current_codes = []
+        predicted_codes = []
+        
+        for i, student in enumerate(self.students):
+            for subject, grades in student['subjects'].items():
+                current = grades['current']
+                predicted = grades['predicted']
+                if current not in codes:
+                    codes[current] = grade_code(current)
+                if predicted not in codes:
+                    codes[predicted] = grade_code(predicted)
+                
+                student_index.append(i)
+                subject_index.append(subject_ids.setdefault(subject, len(subject_ids)))
+                current_codes.append(codes[current])
+                predicted_codes.append(codes[predicted])
+        
+        self.subject_names = list(subject_ids)
+        self.student_index = np.array(student_index, dtype=np.int64)
+        self.subject_id = np.array(subject_index, dtype=np.int32)
+        self.current_code = np.array(current_codes, dtype=np.int16)
+        self.predicted_code = np.array(predicted_codes, dtype=np.int16)
+        
+        # Rows offsets[i]:offsets[i + 1] belong to student i
+        self.offsets = np.zeros(len(self.students) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.student_index, minlength=len(self.students)), out=self.offsets[1:])
+    
+    def _classify(self):
+        """Statuses, per-student counts and priority levels"""
+        self.current_points = _GRADE_POINTS[self.current_code]
+        self.predicted_points = _GRADE_POINTS[self.predicted_code]
+        self.current_scale = _GRADE_SCALES[self.current_code]
+        self.predicted_scale = _GRADE_SCALES[self.predicted_code]
+        self.status = _STATUS_TABLE[self.current_code, self.predicted_code]
+        
+        # Pairs of unrecognised grades are settled by their text, which the table cannot know
+        unknown = np.flatnonzero((self.current_code == UNKNOWN_CODE) & (self.predicted_code == UNKNOWN_CODE))
+        for row in unknown:
+            grades = self.students[self.student_index[row]]['subjects'][self.subject_names[self.subject_id[row]]]
+            self.status[row] = compare_codes(UNKNOWN_CODE, UNKNOWN_CODE, grades['current'], grades['predicted'])
+        
+        self.exceeding_mask = self.status == EXCEEDING
+        self.meeting_mask = (self.status == MEETING) | (self.status == SAME_GRADE)
+        self.below_mask = self.status == BELOW
+        
+        count = len(self.students)
+        self.exceeding_counts = np.bincount(self.student_index[self.exceeding_mask], minlength=count)
+        self.meeting_counts = np.bincount(self.student_index[self.meeting_mask], minlength=count)
+        self.below_counts = np.bincount(self.student_index[self.below_mask], minlength=count)
+        
+        self.priority = np.full(count, PRIORITY_LOW, dtype=np.int8)
+        self.priority[self.below_counts >= MEDIUM_PRIORITY_BELOW] = PRIORITY_MEDIUM
+        self.priority[self.below_counts >= HIGH_PRIORITY_BELOW] = PRIORITY_HIGH
+    
+    def totals(self) -> Dict[str, int]:
+        """Headline counts across all students"""
+        return {
+            'students': len(self.students),
+            'subjects': len(self.subject_names),
+            'exceeding': int(self.exceeding_mask.sum()),
+            'meeting': int(self.meeting_mask.sum()),
+            'below': int(self.below_mask.sum())
+        }
+    
+    def priority_name(self, i: int) -> str:
+        """Priority level of student i as the reports spell it"""
+        return PRIORITY_NAMES[self.priority[i]]
+
+class ReportAggregator:
+    """Single-pass accumulator of per-student analyses; sorted views are built only on request"""
+    
+    def __init__(self):
+        self.students = []
+        self.subjects = set()
+        self.totals = {'exceeding': 0, 'meeting': 0, 'below': 0}
+        self.priority_buckets = {name: [] for name in PRIORITY_NAMES}
+        self.school_counts = {}
+        self._by_name = None
+    
+    def __len__(self) -> int:
+        return len(self.students)
+    
+    def add(self, analysis: Dict):
+        """Fold one student's analysis into the running totals"""
+        self.students.append(analysis)
+        self.subjects.update(subject_info['subject'] for subject_info in analysis['subjects'])
+        for key in self.totals:
+            self.totals[key] += analysis[key]
+        self.priority_buckets[analysis['priority']].append(analysis)
+        self.school_counts[analysis['school']] = self.school_counts.get(analysis['school'], 0) + 1
+        self._by_name = None
+    
+    def by_name(self) -> List[Dict]:
+        """Students sorted by name, ties kept in arrival order"""
+        if self._by_name is None:
+            self._by_name = sorted(self.students, key=lambda x: x["name"])
+        return self._by_name
+    
+    def by_priority(self, priority: Optional[str] = None) -> List[Dict]:
+        """Students of one priority level (or all, most urgent first), each group sorted by name"""
+        if priority is not None:
+            return sorted(self.priority_buckets[priority], key=lambda x: x["name"])
+        return [student for name in reversed(PRIORITY_NAMES) for student in self.by_priority(name)]
+    
+    def grouped(self, keys: Tuple[str, ...] = ('school',)) -> Dict[Tuple, List[Dict]]:
+        """Students grouped by the given fields, groups and members both sorted"""
+        groups = {}
+        for student in self.by_name():
+            groups.setdefault(tuple(str(student[key]) for key in keys), []).append(student)
+        return dict(sorted(groups.items()))
\ No newline at end of file
@@ -1,25 +1,20 @@
 import pandas as pd
 import re
+from tracker_loader import TRACKER_FILE, TRACKER_SHEET, load_tracker_rows
 
 def analyze_grade_formats():
     """Analyze all the different formats in the grade data"""
     try:
-        df = pd.read_excel('KOC Grade Tracker Form(1-52).xlsx', sheet_name='Sheet1')
-        
         print("🔍 ANALYZING GRADE DATA FORMATS")
         print("=" * 80)
         
         current_formats = []
         predicted_formats = []
         
-        for index, row in df.iterrows():
-            name = row['Full Name']
+        for name, school, year, current_text, predicted_text in load_tracker_rows(TRACKER_FILE, TRACKER_SHEET):
             if pd.isna(name) or name.strip() == '':
                 continue
             
-            current_text = row['Please list all the subjects you are currently taking and your current grades']
-            predicted_text = row['Please list all your predicted grades for each subject']
-            
             if not pd.isna(current_text) and str(current_text).strip() not in ['-', 'nan']:
                 current_formats.append({
                     'student': name,
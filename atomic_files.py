@@ -0,0 +1,31 @@
+import os
+import shutil
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+def _discard(path: str):
+    """Remove a leftover temp file or directory, if there is one"""
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """A temp path next to path, unique to this process, moved over path only if the block completes"""
+    # The pid keeps concurrent runs sharing an output (e.g. the state file) off each other's temp file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    _discard(temp_path)
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        _discard(temp_path)
+        raise
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'wb', encoding: Optional[str] = None) -> Iterator[IO]:
+    """Write path through a temp file, so readers never see a partial file"""
+    with atomic_path(path) as temp_path:
+        with open(temp_path, mode, encoding=encoding) as f:
+            yield f
\ No newline at end of file
@@ -0,0 +1,214 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from improved_standardization import ImprovedGradeStandardizer
+from generate_final_reports import (generate_comprehensive_html_report, generate_excel_report,
+                                    generate_sharded_excel_reports, generate_sharded_html_report,
+                                    generate_streaming_html_report, generate_virtualized_html_report,
+                                    iter_student_analyses)
+from report_assets import precompress, precompress_tree, stylesheet_href, write_shared_stylesheet
+from tracker_loader import TRACKER_SHEET, load_tracker_rows
+
+# One standardizer per worker process, created by the pool initializer
+_standardizer = None
+
+def _init_worker():
+    """Build the worker's standardizer once, not once per workbook"""
+    global _standardizer
+    _standardizer = ImprovedGradeStandardizer()
+
+def find_workbooks(source: str) -> List[str]:
+    """Resolve a directory or glob pattern to tracker workbooks"""
+    pattern = os.path.join(source, '*.xlsx') if os.path.isdir(source) else source
+    return sorted(
+        path for path in glob.glob(pattern)
+        if os.path.isfile(path) and not os.path.basename(path).startswith('~$')
+    )
+
+def output_names(workbooks: List[str]) -> Dict[str, str]:
+    """Each workbook's output folder: its path below the workbooks' common folder, minus the extension"""
+    # One form per college and term is often laid out as <college>/<term>.xlsx, so file names repeat
+    base = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in workbooks])
+    names = {}
+    claimed = {}
+    for path in workbooks:
+        name = os.path.splitext(os.path.relpath(os.path.abspath(path), base))[0]
+        key = os.path.normcase(name)
+        if key in claimed:
+            raise ValueError(f"{claimed[key]} and {path} would both be written to {name}")
+        claimed[key] = path
+        names[path] = name
+    return names
+
+def process_workbook(path: str, output_dir: str, sheet_name: str = TRACKER_SHEET, layout: str = 'single',
+                     shared_css: bool = False, compress: bool = False, brotli: bool = False,
+                     school_workbooks: bool = False, workbooks_by_year: bool = False,
+                     name: Optional[str] = None) -> Dict:
+    """Standardize one workbook and write its HTML and Excel reports
+    
+    layout is 'single' (one index.html), 'sharded' (paginated per-school pages),
+    'streaming' (one index.html written with bounded memory) or 'virtualized'
+    (one index.html that only renders the cards in view). Reports go to
+    output_dir/name, name defaulting to the workbook's file name.
+    """
+    if _standardizer is None:
+        _init_worker()
+    
+    started = time.perf_counter()
+    target_dir = os.path.join(output_dir, name or os.path.splitext(os.path.basename(path))[0])
+    os.makedirs(target_dir, exist_ok=True)
+    
+    page_dir = os.path.join(target_dir, 'pages') if layout == 'sharded' else target_dir
+    excel_path = os.path.join(target_dir, 'Final_Student_Grade_Report.xlsx')
+    
+    # Every workbook's pages link the one stylesheet at the top of the output directory
+    href = None
+    if shared_css:
+        href = stylesheet_href(write_shared_stylesheet(output_dir), page_dir)
+    
+    rows = load_tracker_rows(path, sheet_name)
+    if layout == 'streaming':
+        # Students are standardized lazily for each pass, so no list of them is held; the raw
+        # rows are put in name order first so both reports match the single-page layout
+        rows = sorted(rows, key=lambda row: str(row.name).strip())
+        totals = generate_streaming_html_report(_standardizer.iter_students(rows),
+                                                os.path.join(target_dir, 'index.html'), stylesheet_href=href)
+        students_analysis = iter_student_analyses(_standardizer.iter_students(rows))
+        if school_workbooks:
+            students_analysis = list(students_analysis)
+        generate_excel_report(students_analysis, excel_path)
+    else:
+        standardized_data = _standardizer.process_all_data(rows)
+        if layout == 'sharded':
+            students_analysis = generate_sharded_html_report(standardized_data, page_dir, stylesheet_href=href)
+        elif layout == 'virtualized':
+            students_analysis = generate_virtualized_html_report(
+                standardized_data, os.path.join(target_dir, 'index.html'), stylesheet_href=href)
+        else:
+            students_analysis = generate_comprehensive_html_report(
+                standardized_data, os.path.join(target_dir, 'index.html'), stylesheet_href=href)
+        generate_excel_report(students_analysis, excel_path)
+        totals = {
+            'students': len(students_analysis),
+            'exceeding': sum(s['exceeding'] for s in students_analysis),
+            'meeting': sum(s['meeting'] for s in students_analysis),
+            'below': sum(s['below'] for s in students_analysis),
+            'high_priority': sum(1 for s in students_analysis if s['priority'] == 'high')
+        }
+    
+    if school_workbooks:
+        # Already inside a pool worker, so the per-school workbooks are written serially
+        generate_sharded_excel_reports(students_analysis, os.path.join(target_dir, 'schools'),
+                                       workbooks_by_year, workers=1)
+    
+    if compress:
+        precompress_tree(target_dir, brotli)
+    
+    return {
+        'workbook': path,
+        'output_dir': target_dir,
+        'students': totals['students'],
+        'exceeding': totals['exceeding'],
+        'meeting': totals['meeting'],
+        'below': totals['below'],
+        'high_priority': totals['high_priority'],
+        'seconds': time.perf_counter() - started,
+        'error': None
+    }
+
+def run_batch(source: str, output_dir: str = 'batch_reports', workers: Optional[int] = None,
+              sheet_name: str = TRACKER_SHEET, layout: str = 'single', shared_css: bool = False,
+              compress: bool = False, brotli: bool = False, school_workbooks: bool = False,
+              workbooks_by_year: bool = False) -> List[Dict]:
+    """Process every workbook matched by source across a process pool"""
+    workbooks = find_workbooks(source)
+    if not workbooks:
+        print(f"No workbooks found for: {source}")
+        return []
+    
+    # Checked up front, so clashing workbooks never write over each other's reports
+    try:
+        names = output_names(workbooks)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return []
+    
+    workers = min(workers or os.cpu_count() or 1, len(workbooks))
+    print(f"Processing {len(workbooks)} workbooks with {workers} workers...")
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(process_workbook, path, output_dir, sheet_name, layout, shared_css, compress, brotli,
+                        school_workbooks, workbooks_by_year, names[path]): path
+            for path in workbooks
+        }
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({'workbook': futures[future], 'error': str(e)})
+    
+    if shared_css and compress:
+        precompress([write_shared_stylesheet(output_dir)], brotli)
+    
+    return sorted(results, key=lambda r: r['workbook'])
+
+def print_run_summary(results: List[Dict]):
+    """Print a consolidated summary of a batch run"""
+    succeeded = [r for r in results if not r['error']]
+    failed = [r for r in results if r['error']]
+    
+    print("\n📋 BATCH RUN SUMMARY")
+    print("=" * 70)
+    for r in succeeded:
+        print(f"✅ {os.path.basename(r['workbook'])}: {r['students']} students, "
+              f"{r['exceeding']} exceeding, {r['below']} below, "
+              f"{r['high_priority']} high priority ({r['seconds']:.2f}s) → {r['output_dir']}")
+    for r in failed:
+        print(f"❌ {os.path.basename(r['workbook'])}: {r['error']}")
+    
+    print("-" * 70)
+    print(f"   Workbooks processed: {len(succeeded)} / {len(results)}")
+    print(f"   Total students: {sum(r['students'] for r in succeeded)}")
+    print(f"   Subjects exceeding target: {sum(r['exceeding'] for r in succeeded)}")
+    print(f"   Subjects below target: {sum(r['below'] for r in succeeded)}")
+    print(f"   High priority students: {sum(r['high_priority'] for r in succeeded)}")
+
+def main():
+    """Run the report pipeline over a directory or glob of tracker workbooks"""
+    parser = argparse.ArgumentParser(description="Generate grade reports for many tracker workbooks")
+    parser.add_argument('source', help="Directory of .xlsx workbooks or a glob pattern")
+    parser.add_argument('--output-dir', default='batch_reports', help="Where per-workbook reports are written")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--sheet', default=TRACKER_SHEET, help="Sheet holding the form responses")
+    layout = parser.add_mutually_exclusive_group()
+    layout.add_argument('--sharded', dest='layout', action='store_const', const='sharded',
+                        help="Write paginated per-school pages instead of one index.html")
+    layout.add_argument('--streaming', dest='layout', action='store_const', const='streaming',
+                        help="Write index.html card by card with bounded memory, for very large workbooks")
+    layout.add_argument('--virtualized', dest='layout', action='store_const', const='virtualized',
+                        help="Write an index.html that only renders the student cards in view")
+    parser.add_argument('--shared-css', action='store_true', help="Link one content-hashed report.css instead of inlining styles")
+    parser.add_argument('--precompress', action='store_true', help="Also write .gz copies of every HTML/CSS/JS/JSON file")
+    parser.add_argument('--brotli', action='store_true', help="With --precompress, also write .br copies (needs brotli)")
+    parser.add_argument('--school-workbooks', action='store_true', help="Also write one Excel workbook per school plus an index")
+    parser.add_argument('--by-year', action='store_true', help="With --school-workbooks, split each school's workbook by year")
+    parser.set_defaults(layout='single')
+    args = parser.parse_args()
+    
+    print("🎓 BATCH GRADE REPORT GENERATION")
+    print("=" * 70)
+    
+    results = run_batch(args.source, args.output_dir, args.workers, args.sheet, args.layout,
+                        args.shared_css, args.precompress, args.brotli, args.school_workbooks, args.by_year)
+    if results:
+        print_run_summary(results)
+    
+    return results
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+from benchmark_report_scaling import synthetic_students
+from grade_records import load_records, save_records
+
+def synthetic_records(count: int, seed: int = 42) -> List[Dict]:
+    """Synthetic students with raw answer text, shaped like standardized_grades.json"""
+    records = []
+    for student in synthetic_students(count, seed):
+        student['raw_current'] = '\n'.join(f"{subject} - {grades['current']}" for subject, grades in student['subjects'].items())
+        student['raw_predicted'] = '\n'.join(f"{subject} - {grades['predicted']}" for subject, grades in student['subjects'].items())
+        records.append(student)
+    return records
+
+def save_json(records: List[Dict], path: str):
+    """The current output: indented JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+
+def load_json(path: str) -> List[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def timed(func, *args):
+    """Wall-clock seconds for one call, and its result"""
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+def run_benchmark(sizes: List[int]):
+    """Print file size and save/load time of JSON against the binary records"""
+    print(f"{'Students':>10} {'JSON size':>12} {'Binary size':>12} {'JSON save':>10} {'Bin save':>10} "
+          f"{'JSON load':>10} {'Bin load':>10} {'Lossless':>9}")
+    print("-" * 90)
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        for size in sizes:
+            records = synthetic_records(size)
+            json_path = os.path.join(output_dir, f"records_{size}.json")
+            binary_path = os.path.join(output_dir, f"records_{size}.grdb")
+            
+            json_save, _ = timed(save_json, records, json_path)
+            binary_save, _ = timed(save_records, records, binary_path)
+            json_load, _ = timed(load_json, json_path)
+            binary_load, loaded = timed(load_records, binary_path)
+            
+            lossless = 'yes' if json.dumps(loaded) == json.dumps(records) else 'NO'
+            print(f"{size:>10} {os.path.getsize(json_path) / 1024:>10.0f}KB "
+                  f"{os.path.getsize(binary_path) / 1024:>10.0f}KB "
+                  f"{json_save:>9.3f}s {binary_save:>9.3f}s {json_load:>9.3f}s {binary_load:>9.3f}s {lossless:>9}")
+
+def main():
+    """Benchmark the standardized record formats from 50 to 50k students"""
+    parser = argparse.ArgumentParser(description="Compare JSON and binary standardized record files")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000, 50000],
+                        help="Student counts to benchmark")
+    args = parser.parse_args()
+    
+    print("⏱️ STANDARDIZED RECORD FORMAT BENCHMARK")
+    print("=" * 90)
+    run_benchmark(args.sizes)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,92 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List
+from analysis_engine import ReportAggregator
+from generate_final_reports import generate_comprehensive_html_report
+
+SUBJECTS = ['Mathematics', 'English Literature', 'Biology', 'Chemistry', 'Physics', 'History', 'Geography',
+            'Psychology', 'Sociology', 'Business Studies', 'Economics', 'BTEC Sport', 'Art']
+GRADES = ['9', '8', '7', '6', '5', '4', 'A*', 'A', 'B', 'C', 'D', 'Merit', 'Distinction', 'Pass', 'N/A']
+SCHOOLS = ['Kharis Academy', 'Riverside School', 'Hillcrest College', 'Oakfield High']
+YEARS = ['Year 11', 'Year 12', 'Year 13']
+
+def synthetic_students(count: int, seed: int = 42) -> List[Dict]:
+    """Standardized-looking student records with random subjects and grades"""
+    rng = random.Random(seed)
+    students = []
+    for i in range(count):
+        subjects = {
+            subject: {'current': rng.choice(GRADES), 'predicted': rng.choice(GRADES)}
+            for subject in rng.sample(SUBJECTS, rng.randint(3, 8))
+        }
+        students.append({
+            'name': f"Student {rng.randrange(count * 10):07d}",
+            'school': rng.choice(SCHOOLS),
+            'year': rng.choice(YEARS),
+            'subjects': subjects
+        })
+    return students
+
+def resort_every_append(analyses: List[Dict]) -> List[Dict]:
+    """The old accumulation: re-sort the whole list after every student"""
+    students_analysis = []
+    for analysis in analyses:
+        students_analysis.append(analysis)
+        students_analysis = sorted(students_analysis, key=lambda x: x["name"])
+    return students_analysis
+
+def aggregate_once(analyses: List[Dict]) -> List[Dict]:
+    """The single-pass aggregator with one sort at the end"""
+    aggregator = ReportAggregator()
+    for analysis in analyses:
+        aggregator.add(analysis)
+    return aggregator.by_name()
+
+def timed(func, *args) -> float:
+    """Wall-clock seconds for one call"""
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+def run_benchmark(sizes: List[int], resort_limit: int, workers: int = 1):
+    """Print the scaling curve of report generation and of the accumulation step alone"""
+    print(f"{'Students':>10} {'Full report':>14} {'Aggregator':>12} {'Re-sort loop':>14}")
+    print("-" * 54)
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        for size in sizes:
+            students = synthetic_students(size)
+            output_path = os.path.join(output_dir, f"report_{size}.html")
+            
+            started = time.perf_counter()
+            analyses = generate_comprehensive_html_report(students, output_path, workers=workers)
+            report_seconds = time.perf_counter() - started
+            
+            aggregator_seconds = timed(aggregate_once, analyses)
+            if size <= resort_limit:
+                resort = f"{timed(resort_every_append, analyses):.4f}s"
+            else:
+                resort = "skipped"
+            
+            print(f"{size:>10} {report_seconds:>13.4f}s {aggregator_seconds:>11.4f}s {resort:>14}")
+
+def main():
+    """Benchmark report generation from 50 to 50k students"""
+    parser = argparse.ArgumentParser(description="Benchmark how report generation scales with student count")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000, 50000],
+                        help="Student counts to benchmark")
+    parser.add_argument('--resort-limit', type=int, default=5000,
+                        help="Largest size to run the old re-sort loop on (it is quadratic)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes to render student cards with")
+    args = parser.parse_args()
+    
+    print("⏱️ REPORT GENERATION SCALING BENCHMARK")
+    print("=" * 54)
+    run_benchmark(args.sizes, args.resort_limit, args.workers)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,6 +1,9 @@
 import pandas as pd
 import re
 from typing import Dict, List, Tuple
+from grade_scales import (BELOW, CURRENT_ONLY, DIFFERENT_SYSTEMS, EXCEEDING, MEETING, NO_DATA,
+                          SAME_GRADE, TARGET_SET, compare_grade_status)
+from tracker_loader import TRACKER_FILE, TRACKER_SHEET, load_tracker_rows
 
 def parse_subject_grades(text: str) -> Dict[str, str]:
     """Parse subject-grade pairs from text"""
@@ -58,71 +61,32 @@ def parse_subject_grades(text: str) -> Dict[str, str]:
     
     return grades
 
-def grade_to_points(grade: str) -> int:
-    """Convert UK grades to point system for comparison"""
-    grade = grade.upper().strip()
-    
-    # GCSE 9-1 system
-    gcse_points = {'9': 9, '8': 8, '7': 7, '6': 6, '5': 5, '4': 4, '3': 3, '2': 2, '1': 1, 'U': 0}
-    
-    # A-Level system  
-    alevel_points = {'A*': 6, 'A': 5, 'B': 4, 'C': 3, 'D': 2, 'E': 1, 'U': 0}
-    
-    # BTEC system
-    btec_points = {'D*': 4, 'DISTINCTION*': 4, 'D': 3, 'DISTINCTION': 3, 'M': 2, 'MERIT': 2, 'P': 1, 'PASS': 1}
-    
-    if grade in gcse_points:
-        return gcse_points[grade]
-    elif grade in alevel_points:
-        return alevel_points[grade]
-    elif grade in btec_points:
-        return btec_points[grade]
-    
-    return -1  # Unknown grade
+# Report wording for each grade comparison outcome
+STATUS_LABELS = {
+    NO_DATA: ("❓ No Data", "gray"),
+    TARGET_SET: ("🎯 Target Set", "blue"),
+    CURRENT_ONLY: ("📈 Has Current Grade", "green"),
+    EXCEEDING: ("🎉 Exceeding Target", "green"),
+    MEETING: ("✅ Meeting Target", "green"),
+    BELOW: ("⚠️ Below Target", "red"),
+    SAME_GRADE: ("✅ Matching", "green"),
+    DIFFERENT_SYSTEMS: ("📊 Different Format", "yellow")
+}
 
 def compare_performance(current: str, predicted: str) -> Tuple[str, str]:
     """Compare current vs predicted performance"""
-    if current == 'N/A' and predicted == 'N/A':
-        return "❓ No Data", "gray"
-    elif current == 'N/A':
-        return "🎯 Target Set", "blue"
-    elif predicted == 'N/A':
-        return "📈 Has Current Grade", "green"
-    
-    current_points = grade_to_points(current)
-    predicted_points = grade_to_points(predicted)
-    
-    if current_points == -1 or predicted_points == -1:
-        if current.upper() == predicted.upper():
-            return "✅ Matching", "green"
-        else:
-            return "📊 Different Format", "yellow"
-    
-    if current_points > predicted_points:
-        return "🎉 Exceeding Target", "green"
-    elif current_points == predicted_points:
-        return "✅ Meeting Target", "green"
-    else:
-        return "⚠️ Below Target", "red"
+    return STATUS_LABELS[compare_grade_status(current, predicted)]
 
 def create_detailed_report():
     """Create detailed individual student reports"""
     try:
-        df = pd.read_excel('KOC Grade Tracker Form(1-52).xlsx', sheet_name='Sheet1')
-        
         print("🎓 DETAILED UK STUDENT GRADE ANALYSIS")
         print("=" * 100)
         
-        for index, row in df.iterrows():
-            name = row['Full Name']
+        for name, school, year, current_text, predicted_text in load_tracker_rows(TRACKER_FILE, TRACKER_SHEET):
             if pd.isna(name) or name.strip() == '':
                 continue
             
-            school = row['School You Attend']
-            year = row['What year are you in']
-            current_text = row['Please list all the subjects you are currently taking and your current grades']
-            predicted_text = row['Please list all your predicted grades for each subject']
-            
             print(f"\n👤 STUDENT: {name}")
             print(f"🏫 School: {school}")
             print(f"📅 Year: {year}")
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import pickle
+from atomic_files import atomic_write
+from typing import Callable, Dict, Hashable, List, Tuple
+from report_templates import TEMPLATES, Writer, render_student_card
+from tracker_loader import CACHE_DIR
+
+FRAGMENT_CACHE_FILE = os.path.join(CACHE_DIR, 'fragments.pickle')
+
+# Changing any card template invalidates every cached card
+_CARD_TEMPLATES = ('student_card_open', 'performance_summary', 'grade_row', 'student_card_close')
+CARD_TEMPLATE_VERSION = hashlib.sha1(
+    ''.join(TEMPLATES[name] for name in _CARD_TEMPLATES).encode('utf-8')).hexdigest()[:12]
+
+class FragmentCache:
+    """Rendered HTML fragments kept between runs, keyed by a snapshot of what they were rendered from"""
+    
+    def __init__(self, path: str = FRAGMENT_CACHE_FILE):
+        self.path = path
+        self._stored = self._load()
+        self._used = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def _load(self) -> Dict[Hashable, str]:
+        """Fragments saved by the previous run, or nothing if the cache is missing or unreadable"""
+        try:
+            with open(self.path, 'rb') as f:
+                fragments = pickle.load(f)
+            return fragments if isinstance(fragments, dict) else {}
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return {}
+    
+    def fragment(self, key: Hashable, render: Callable[[Writer], None]) -> str:
+        """The cached fragment for key, rendering it only if it is new or changed"""
+        # The key tuple itself is the dict key: hashing it is far cheaper than
+        # serialising and digesting it, which would cost more than the render
+        html = self._used.get(key)
+        if html is None:
+            html = self._stored.get(key)
+        
+        if html is None:
+            self.misses += 1
+            parts = []
+            render(parts.append)
+            html = ''.join(parts)
+        else:
+            self.hits += 1
+        
+        self._used[key] = html
+        return html
+    
+    def save(self):
+        """Persist the fragments used by this run; ones no longer in the report are dropped"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with atomic_write(self.path) as f:
+                pickle.dump(self._used, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"Warning: could not write fragment cache: {e}")
+
+def _subjects_key(subjects: List[Dict]) -> Tuple:
+    """Hashable snapshot of a student's analysed subjects"""
+    return tuple((s['subject'], s['current'], s['predicted'], s['status'], s['color'], s['icon']) for s in subjects)
+
+def card_key(student: Dict, options: Dict) -> Tuple:
+    """Everything a student card is rendered from, as a hashable tuple"""
+    subjects = options.get('subjects')
+    return (
+        CARD_TEMPLATE_VERSION,
+        student['name'], student['school'], student['year'], student['priority'],
+        student['exceeding'], student['meeting'], student['below'],
+        _subjects_key(student['subjects'] if subjects is None else subjects),
+        tuple(sorted((name, value) for name, value in options.items() if name != 'subjects'))
+    )
+
+def render_cached_student_card(write: Writer, cache: FragmentCache, student: Dict, **options):
+    """render_student_card, reusing the previous run's HTML when the student is unchanged"""
+    write(cache.fragment(card_key(student, options),
+                         lambda card_write: render_student_card(card_write, student, **options)))
\ No newline at end of file
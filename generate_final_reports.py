@@ -1,505 +1,580 @@
-import pandas as pd
+import argparse
 import json
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from improved_standardization import ImprovedGradeStandardizer
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+from analysis_engine import GradeAnalysis, ReportAggregator
+from fragment_cache import FragmentCache, render_cached_student_card
+from grade_records import RECORDS_FILE, load_records
+from grade_scales import (BELOW, CURRENT_ONLY, DIFFERENT_SYSTEMS, EXCEEDING, MEETING, NO_DATA,
+                          SAME_GRADE, TARGET_SET, compare_grade_status)
+from improved_standardization import STATE_FILE, ImprovedGradeStandardizer, records_source_tag
+from report_assets import precompress, stylesheet_href, write_shared_stylesheet
+from report_templates import (FINAL_STYLESHEET, PAGINATION_STYLESHEET, SEARCH_STYLESHEET, VIEWPORT_META,
+                              VIRTUAL_STYLESHEET, render_page_head, render_pagination, render_section_close,
+                              render_section_open, render_student_card, render_summary_stats, template)
+from search_index import build_search_index, write_search_index
+from tracker_loader import TRACKER_FILE, TRACKER_SHEET, load_tracker_rows
 
-def grade_to_points(grade: str) -> int:
-    """Convert grades to points for comparison"""
-    grade = grade.upper().strip()
+# Report wording for each grade comparison outcome
+STATUS_LABELS = {
+    NO_DATA: ("No Data", "gray", "❓"),
+    TARGET_SET: ("Target Set", "blue", "🎯"),
+    CURRENT_ONLY: ("Current Only", "green", "📈"),
+    EXCEEDING: ("Exceeding Target", "darkgreen", "🎉"),
+    MEETING: ("Meeting Target", "green", "✅"),
+    BELOW: ("Below Target", "red", "⚠️"),
+    SAME_GRADE: ("Meeting Target", "green", "✅"),
+    DIFFERENT_SYSTEMS: ("Different Systems", "yellow", "📊")
+}
+
+# Students classified together when analysis runs over a stream
+ANALYSIS_BATCH_SIZE = 1000
+
+# Rendered cards stay in memory up to this size before spilling to a temp file
+SPOOL_SIZE = 8 * 1024 * 1024
+COPY_CHUNK_SIZE = 64 * 1024
+
+# Parallel card rendering: chunks per worker, and the cohort size below which
+# starting a pool costs more than it saves
+PARALLEL_CHUNKS_PER_WORKER = 4
+PARALLEL_RENDER_MIN_STUDENTS = 2000
+
+# Column headings of the Excel report sheets
+EXCEL_SUMMARY_COLUMNS = ['Student Name', 'School', 'Year', 'Total Subjects', 'Exceeding Target',
+                         'Meeting Target', 'Below Target', 'Priority Level', 'Needs Attention']
+EXCEL_GRADES_COLUMNS = ['Student Name', 'School', 'Year', 'Subject', 'Current Grade', 'Target Grade',
+                        'Status', 'Priority Level']
+EXCEL_PRIORITY_COLUMNS = ['Student Name', 'School', 'Year', 'Subject', 'Current Grade', 'Target Grade',
+                          'Grade Gap', 'Action Required']
+
+# Sharded Excel export: the index workbook and its columns after the school (and year)
+EXCEL_INDEX_FILE = 'index.xlsx'
+EXCEL_INDEX_COLUMNS = ['Workbook', 'Students', 'Subject Entries', 'Exceeding Target', 'Meeting Target',
+                       'Below Target', 'High Priority']
+
+# Student cards per page in the sharded report
+SHARD_PAGE_SIZE = 100
+
+def compare_grades(current: str, predicted: str) -> tuple:
+    """Compare current vs predicted grades"""
+    return STATUS_LABELS[compare_grade_status(current, predicted)]
+
+def iter_student_analyses(standardized_data: Iterable[Dict], batch_size: int = ANALYSIS_BATCH_SIZE) -> Iterator[Dict]:
+    """Per-student analyses, classified a batch at a time so the input can be a stream"""
+    students = iter(standardized_data)
+    while True:
+        batch = list(islice(students, batch_size))
+        if not batch:
+            return
+        
+        grade_analysis = GradeAnalysis(batch)
+        for i, student in enumerate(grade_analysis.students):
+            analysis = {
+                'name': student['name'],
+                'school': student['school'],
+                'year': student['year'],
+                'subjects': [],
+                'exceeding': int(grade_analysis.exceeding_counts[i]),
+                'meeting': int(grade_analysis.meeting_counts[i]),
+                'below': int(grade_analysis.below_counts[i]),
+                'priority': grade_analysis.priority_name(i)
+            }
+            
+            statuses = grade_analysis.status[grade_analysis.offsets[i]:grade_analysis.offsets[i + 1]]
+            for (subject, grades), status_code in zip(student['subjects'].items(), statuses):
+                status, color, icon = STATUS_LABELS[status_code]
+                
+                analysis['subjects'].append({
+                    'subject': subject,
+                    'current': grades['current'],
+                    'predicted': grades['predicted'],
+                    'status': status,
+                    'color': color,
+                    'icon': icon
+                })
+            
+            yield analysis
+
+def _render_card_chunk(students: List[Dict]) -> str:
+    """Pool task: the cards of one chunk of students, concatenated"""
+    parts = []
+    for student in students:
+        render_student_card(parts.append, student, strong_subjects=True)
+    return ''.join(parts)
+
+def render_cards_parallel(students: List[Dict], workers: Optional[int] = None) -> Iterator[str]:
+    """Student cards rendered across a process pool, yielded in the input order"""
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, -(-len(students) // (workers * PARALLEL_CHUNKS_PER_WORKER)))
+    chunks = [students[i:i + chunk_size] for i in range(0, len(students), chunk_size)]
     
-    # GCSE 9-1 system
-    gcse_points = {'9': 9, '8': 8, '7': 7, '6': 6, '5': 5, '4': 4, '3': 3, '2': 2, '1': 1, 'U': 0}
+    # map() returns results in submission order, so the page matches the serial render
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)) or 1) as pool:
+        yield from pool.map(_render_card_chunk, chunks)
+
+def generate_comprehensive_html_report(standardized_data, output_path='index.html', with_search=True,
+                                       fragment_cache: Optional[FragmentCache] = None,
+                                       stylesheet_href: Optional[str] = None, workers: int = 1):
+    """Generate the final HTML report using standardized data"""
     
-    # A-Level system
-    alevel_points = {'A*': 6, 'A': 5, 'B': 4, 'C': 3, 'D': 2, 'E': 1, 'U': 0}
+    # Classify every subject in bulk, then build the per-student view the writers use
+    aggregator = ReportAggregator()
+    for analysis in iter_student_analyses(standardized_data):
+        aggregator.add(analysis)
     
-    # BTEC system
-    btec_points = {'D*': 4, 'DISTINCTION': 4, 'MERIT': 2, 'PASS': 1}
+    students_analysis = aggregator.by_name()
+    total_exceeding = aggregator.totals['exceeding']
+    total_below = aggregator.totals['below']
+    all_subjects = aggregator.subjects
     
-    if grade in gcse_points:
-        return gcse_points[grade]
-    elif grade in alevel_points:
-        return alevel_points[grade]
-    elif grade in btec_points:
-        return btec_points[grade]
+    generated = datetime.now().strftime('%B %d, %Y at %I:%M %p')
     
-    return -1
-
-def compare_grades(current: str, predicted: str) -> tuple:
-    """Compare current vs predicted grades"""
-    if current == 'N/A' and predicted == 'N/A':
-        return "No Data", "gray", "❓"
-    elif current == 'N/A':
-        return "Target Set", "blue", "🎯"
-    elif predicted == 'N/A':
-        return "Current Only", "green", "📈"
-    
-    current_points = grade_to_points(current)
-    predicted_points = grade_to_points(predicted)
-    
-    if current_points == -1 or predicted_points == -1:
-        if current.upper() == predicted.upper():
-            return "Meeting Target", "green", "✅"
+    # The search index ships next to the page and is queried in the browser
+    search_script = None
+    if with_search:
+        search_script = os.path.splitext(os.path.basename(output_path))[0] + '-search.js'
+        write_search_index(build_search_index(students_analysis),
+                           os.path.join(os.path.dirname(output_path), search_script))
+    
+    # Render through the shared templates straight into the output file
+    with open(output_path, 'w', encoding='utf-8') as f:
+        write = f.write
+        render_page_head(write, FINAL_STYLESHEET + SEARCH_STYLESHEET,
+                         template('final_header').render({'generated': generated}), VIEWPORT_META, stylesheet_href)
+        render_summary_stats(write, [
+            (len(students_analysis), 'Total Students'),
+            (len(all_subjects), 'Unique Subjects'),
+            (total_exceeding, 'Exceeding Targets'),
+            (total_below, 'Below Targets')
+        ])
+        
+        if search_script:
+            template('search_box').write(write, {'src': search_script})
+        
+        # All students overview
+        render_section_open(write, '📊 Complete Student Overview')
+        students_with_subjects = [student for student in students_analysis if student['subjects']]
+        if fragment_cache is not None:
+            # Cached cards are cheaper to reuse than to ship to a pool
+            for student in students_with_subjects:
+                render_cached_student_card(write, fragment_cache, student, strong_subjects=True)
+        elif workers > 1 and len(students_with_subjects) >= PARALLEL_RENDER_MIN_STUDENTS:
+            for chunk in render_cards_parallel(students_with_subjects, workers):
+                write(chunk)
         else:
-            return "Different Systems", "yellow", "📊"
+            for student in students_with_subjects:
+                render_student_card(write, student, strong_subjects=True)
+        render_section_close(write)
+        
+        template('final_footer').write(write, {
+            'generated': generated,
+            'students': len(students_analysis),
+            'subjects': len(all_subjects)
+        })
     
-    if current_points > predicted_points:
-        return "Exceeding Target", "darkgreen", "🎉"
-    elif current_points == predicted_points:
-        return "Meeting Target", "green", "✅"
-    else:
-        return "Below Target", "red", "⚠️"
-
-def generate_comprehensive_html_report(standardized_data):
-    """Generate the final HTML report using standardized data"""
+    if fragment_cache is not None:
+        fragment_cache.save()
     
-    # Process data for analysis
-    students_analysis = []
-    total_exceeding = 0
-    total_meeting = 0
-    total_below = 0
+    return students_analysis
+
+def generate_streaming_html_report(standardized_students: Iterable[Dict], output_path='index.html',
+                                    spool_size: int = SPOOL_SIZE,
+                                    stylesheet_href: Optional[str] = None) -> Dict[str, int]:
+    """Write the HTML report card by card as students arrive, with bounded memory"""
+    totals = {'students': 0, 'exceeding': 0, 'meeting': 0, 'below': 0, 'high_priority': 0}
     all_subjects = set()
     
-    for student in standardized_data:
-        if not student['subjects']:
-            continue
-            
-        analysis = {
-            'name': student['name'],
-            'school': student['school'],
-            'year': student['year'],
-            'subjects': [],
-            'exceeding': 0,
-            'meeting': 0,
-            'below': 0,
-            'priority': 'low'
-        }
+    # Pass one: cards go to a spooled temp file (in memory up to spool_size, then on disk)
+    # while the header stats are counted
+    with tempfile.SpooledTemporaryFile(max_size=spool_size, mode='w+', encoding='utf-8') as cards:
+        for analysis in iter_student_analyses(standardized_students):
+            render_student_card(cards.write, analysis, strong_subjects=True)
+            totals['students'] += 1
+            totals['exceeding'] += analysis['exceeding']
+            totals['meeting'] += analysis['meeting']
+            totals['below'] += analysis['below']
+            totals['high_priority'] += analysis['priority'] == 'high'
+            all_subjects.update(subject_info['subject'] for subject_info in analysis['subjects'])
+        totals['subjects'] = len(all_subjects)
         
-        for subject, grades in student['subjects'].items():
-            current = grades['current']
-            predicted = grades['predicted']
-            status, color, icon = compare_grades(current, predicted)
-            
-            analysis['subjects'].append({
-                'subject': subject,
-                'current': current,
-                'predicted': predicted,
-                'status': status,
-                'color': color,
-                'icon': icon
-            })
+        generated = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+        
+        # Pass two: header with the final counts, then the cards copied across in chunks
+        with open(output_path, 'w', encoding='utf-8') as f:
+            write = f.write
+            render_page_head(write, FINAL_STYLESHEET, template('final_header').render({'generated': generated}),
+                             VIEWPORT_META, stylesheet_href)
+            render_summary_stats(write, [
+                (totals['students'], 'Total Students'),
+                (totals['subjects'], 'Unique Subjects'),
+                (totals['exceeding'], 'Exceeding Targets'),
+                (totals['below'], 'Below Targets')
+            ])
             
-            all_subjects.add(subject)
+            render_section_open(write, '📊 Complete Student Overview')
+            cards.seek(0)
+            shutil.copyfileobj(cards, f, COPY_CHUNK_SIZE)
+            render_section_close(write)
             
-            if "Exceeding" in status:
-                analysis['exceeding'] += 1
-                total_exceeding += 1
-            elif "Meeting" in status:
-                analysis['meeting'] += 1
-                total_meeting += 1
-            elif "Below" in status:
-                analysis['below'] += 1
-                total_below += 1
-        
-        # Determine priority
-        if analysis['below'] >= 3:
-            analysis['priority'] = 'high'
-        elif analysis['below'] >= 1:
-            analysis['priority'] = 'medium'
-        
-        students_analysis.append(analysis)
-        students_analysis = sorted(students_analysis, key=lambda x: x["name"])
-    
-    # Generate HTML
-    html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Colleges Grade Analysis Report</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 30px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 40px;
-            border-bottom: 3px solid #2c3e50;
-            padding-bottom: 20px;
-        }}
-        .header h1 {{
-            color: #2c3e50;
-            margin: 0;
-            font-size: 2.8em;
-            font-weight: 700;
-        }}
-        .header p {{
-            color: #7f8c8d;
-            margin: 15px 0 0 0;
-            font-size: 1.2em;
-        }}
-        .summary-stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 25px;
-            margin-bottom: 40px;
-        }}
-        .stat-card {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 25px;
-            border-radius: 15px;
-            text-align: center;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            transition: transform 0.3s ease;
-        }}
-        .stat-card:hover {{
-            transform: translateY(-5px);
-        }}
-        .stat-number {{
-            font-size: 3em;
-            font-weight: bold;
-            margin-bottom: 10px;
-        }}
-        .stat-label {{
-            font-size: 1em;
-            opacity: 0.9;
-        }}
-        .section {{
-            margin-bottom: 50px;
-        }}
-        .section h2 {{
-            color: #2c3e50;
-            border-left: 6px solid #3498db;
-            padding-left: 20px;
-            margin-bottom: 25px;
-            font-size: 1.8em;
-        }}
-        .student-card {{
-            background-color: #f8f9fa;
-            border: 1px solid #dee2e6;
-            border-radius: 12px;
-            padding: 25px;
-            margin-bottom: 25px;
-            transition: box-shadow 0.3s ease;
-        }}
-        .student-card:hover {{
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-        }}
-        .student-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 20px;
-            flex-wrap: wrap;
-        }}
-        .student-name {{
-            font-size: 1.4em;
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-        .student-info {{
-            color: #6c757d;
-            font-size: 1em;
-        }}
-        .grades-table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 15px;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
-        .grades-table th, .grades-table td {{
-            padding: 12px 15px;
-            text-align: left;
-            border-bottom: 1px solid #dee2e6;
-        }}
-        .grades-table th {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            font-weight: 600;
-        }}
-        .grades-table tr:nth-child(even) {{
-            background-color: #f8f9fa;
-        }}
-        .grades-table tr:hover {{
-            background-color: #e9ecef;
-        }}
-        .status-exceeding {{ color: #28a745; font-weight: bold; }}
-        .status-meeting {{ color: #28a745; }}
-        .status-below {{ color: #dc3545; font-weight: bold; }}
-        .status-gray {{ color: #6c757d; }}
-        .status-blue {{ color: #007bff; }}
-        .status-green {{ color: #28a745; }}
-        .status-yellow {{ color: #ffc107; }}
-        .status-darkgreen {{ color: #155724; font-weight: bold; }}
-        .status-red {{ color: #dc3545; font-weight: bold; }}
+            template('final_footer').write(write, {
+                'generated': generated,
+                'students': totals['students'],
+                'subjects': totals['subjects']
+            })
+    
+    return totals
+
+def _page_slug(text: str) -> str:
+    """File-name-safe form of a school or year"""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'unknown'
+
+def _group_slug(group: tuple, used_slugs: set) -> str:
+    """File-name stem for a school (and year) group, numbered if another group already took it"""
+    slug = base_slug = '-'.join(_page_slug(part) for part in group)
+    suffix = 2
+    while slug in used_slugs:
+        slug = f"{base_slug}-{suffix}"
+        suffix += 1
+    used_slugs.add(slug)
+    return slug
+
+def generate_sharded_html_report(standardized_data, output_dir='report_pages', page_size=SHARD_PAGE_SIZE,
+                                 by_year=False, stylesheet_href: Optional[str] = None):
+    """Write a landing page of summary stats plus paginated student pages per school (and year)"""
+    aggregator = ReportAggregator()
+    for analysis in iter_student_analyses(standardized_data):
+        aggregator.add(analysis)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    generated = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+    stylesheet = FINAL_STYLESHEET + PAGINATION_STYLESHEET
+    keys = ('school', 'year') if by_year else ('school',)
+    
+    shards = []
+    used_slugs = set()
+    for group, students in aggregator.grouped(keys).items():
+        slug = _group_slug(group, used_slugs)
+        pages = [f"{slug}-{number + 1}.html" for number in range(-(-len(students) // page_size))]
+        title = ' | '.join(f"{icon} {part}" for icon, part in zip(('🏫', '📅'), group))
         
-        .performance-summary {{
-            background: linear-gradient(135deg, #e3f2fd 0%, #bbdefb 100%);
-            border-left: 5px solid #2196f3;
-            padding: 20px;
-            margin-top: 20px;
-            border-radius: 0 10px 10px 0;
-        }}
-        .alert-attention {{
-            background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%);
-            border: 1px solid #ffeaa7;
-            border-radius: 10px;
-            padding: 20px;
-            margin-bottom: 25px;
-        }}
-        .alert-success {{
-            background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
-            border: 1px solid #c3e6cb;
-            border-radius: 10px;
-            padding: 20px;
-            margin-bottom: 25px;
-        }}
-        .priority-high {{ border-left: 6px solid #dc3545; }}
-        .priority-medium {{ border-left: 6px solid #ffc107; }}
-        .priority-low {{ border-left: 6px solid #28a745; }}
+        for number, page in enumerate(pages):
+            with open(os.path.join(output_dir, page), 'w', encoding='utf-8') as f:
+                write = f.write
+                header = template('shard_header').render({
+                    'title': f"{title} — page {number + 1} of {len(pages)}",
+                    'generated': generated
+                })
+                render_page_head(write, stylesheet, header, VIEWPORT_META, stylesheet_href)
+                render_pagination(write, pages, number)
+                
+                render_section_open(write, f"📊 {title}")
+                for student in students[number * page_size:(number + 1) * page_size]:
+                    render_student_card(write, student, strong_subjects=True)
+                render_section_close(write)
+                
+                render_pagination(write, pages, number)
+                template('page_close').write(write, {})
         
-        .recommendations {{
-            background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-            padding: 30px;
-            border-radius: 15px;
-            border: 1px solid #dee2e6;
-        }}
-        .recommendations ol {{
-            line-height: 2;
-            font-size: 1.1em;
-        }}
-        .recommendations li {{
-            margin-bottom: 10px;
-        }}
+        shards.append({
+            'href': pages[0],
+            'school': group[0],
+            'year': group[1] if by_year else 'All',
+            'students': len(students),
+            'exceeding': sum(student['exceeding'] for student in students),
+            'below': sum(student['below'] for student in students),
+            'pages': len(pages)
+        })
+    
+    # Landing page: summary stats and a link to each shard
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        write = f.write
+        render_page_head(write, stylesheet, template('final_header').render({'generated': generated}),
+                         VIEWPORT_META, stylesheet_href)
+        render_summary_stats(write, [
+            (len(aggregator), 'Total Students'),
+            (len(aggregator.subjects), 'Unique Subjects'),
+            (aggregator.totals['exceeding'], 'Exceeding Targets'),
+            (aggregator.totals['below'], 'Below Targets')
+        ])
         
-        @media (max-width: 768px) {{
-            .container {{ padding: 15px; }}
-            .student-header {{ flex-direction: column; align-items: flex-start; }}
-            .grades-table {{ font-size: 0.9em; }}
-            .stat-card {{ padding: 20px; }}
-            .header h1 {{ font-size: 2.2em; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🎓 Colleges Grade Analysis Report</h1>
-            <p>Comprehensive Academic Performance Review</p>
-            <p style="font-size: 0.9em; color: #95a5a6;">Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>
-        </div>
+        render_section_open(write, '🏫 Reports by School')
+        template('shard_table_open').write(write, {})
+        row = template('shard_row')
+        for shard in shards:
+            row.write(write, shard)
+        template('shard_table_close').write(write, {})
+        render_section_close(write)
         
-        <div class="summary-stats">
-            <div class="stat-card">
-                <div class="stat-number">{len(students_analysis)}</div>
-                <div class="stat-label">Total Students</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{len(all_subjects)}</div>
-                <div class="stat-label">Unique Subjects</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{total_exceeding}</div>
-                <div class="stat-label">Exceeding Targets</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{total_below}</div>
-                <div class="stat-label">Below Targets</div>
-            </div>
-        </div>
-"""
-    
-    # All students overview
-    html_content += """
-        <div class="section">
-            <h2>📊 Complete Student Overview</h2>
-"""
+        template('final_footer').write(write, {
+            'generated': generated,
+            'students': len(aggregator),
+            'subjects': len(aggregator.subjects)
+        })
     
+    return aggregator.by_name()
+
+def build_report_payload(students_analysis: List[Dict]) -> Dict:
+    """Compact, list-based form of the analysis for client-side rendering"""
+    statuses = {}
+    students = []
     for student in students_analysis:
-        if not student['subjects']:
-            continue
-            
-        priority_class = f"priority-{student['priority']}"
-        html_content += f"""
-            <div class="student-card {priority_class}">
-                <div class="student-header">
-                    <div class="student-name">👤 {student['name']}</div>
-                    <div class="student-info">🏫 {student['school']} | 📅 {student['year']}</div>
-                </div>
-                <table class="grades-table">
-                    <thead>
-                        <tr>
-                            <th>Subject</th>
-                            <th>Current Grade</th>
-                            <th>Target Grade</th>
-                            <th>Status</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-"""
+        grades = []
         for subject_info in student['subjects']:
-            status_class = f"status-{subject_info['color'].replace('dark', '')}"
-            html_content += f"""
-                        <tr>
-                            <td><strong>{subject_info['subject']}</strong></td>
-                            <td>{subject_info['current']}</td>
-                            <td>{subject_info['predicted']}</td>
-                            <td class="{status_class}">{subject_info['icon']} {subject_info['status']}</td>
-                        </tr>
-"""
-        html_content += """
-                    </tbody>
-                </table>
-            </div>
-"""
-    
-    # Recommendations section
-    html_content += f"""
-        </div>
-        
-        <div class="section">
-            <h2>💡 Strategic Recommendations</h2>
-            <div class="recommendations">
-                <ol>
-                    <li><strong>📚 Subject-Specific Tutoring:</strong> Focus additional resources on commonly struggling subjects, particularly Mathematics and English</li>
-                    <li><strong>📈 Progress Monitoring:</strong> Implement weekly progress reviews for Year 13 students approaching final examinations</li>
-                    <li><strong>🤝 Peer Mentoring:</strong> Establish partnerships between high-achieving and struggling students</li>
-                    <li><strong>👨‍👩‍👧‍👦 Parent Engagement:</strong> Schedule urgent meetings with parents of priority students</li>
-                    <li><strong>📊 Data-Driven Decisions:</strong> Use this analysis to allocate teaching resources and plan intervention strategies</li>
-                </ol>
-            </div>
-        </div>
-        
-        <div style="text-align: center; margin-top: 40px; padding: 20px; background-color: #f8f9fa; border-radius: 10px;">
-            <p style="color: #6c757d; margin: 0;">
-                <strong>Report Generated:</strong> {datetime.now().strftime('%B %d, %Y at %I:%M %p')} | 
-                <strong>Total Students Analyzed:</strong> {len(students_analysis)} | 
-                <strong>Subjects Tracked:</strong> {len(all_subjects)}
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-    
-    # Save HTML file
-    with open('index.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
+            key = (subject_info['status'], subject_info['color'].replace('dark', ''), subject_info['icon'])
+            grades.append([str(subject_info['subject']), str(subject_info['current']),
+                           str(subject_info['predicted']), statuses.setdefault(key, len(statuses))])
+        students.append([str(student['name']), str(student['school']), str(student['year']), student['priority'],
+                         student['exceeding'], student['meeting'], student['below'], grades])
+    
+    return {'statuses': [list(key) for key in statuses], 'students': students}
+
+def generate_virtualized_html_report(standardized_data, output_path='index.html', sidecar=False,
+                                     stylesheet_href: Optional[str] = None):
+    """HTML report whose student cards are rendered in the browser, only for what is on screen"""
+    aggregator = ReportAggregator()
+    for analysis in iter_student_analyses(standardized_data):
+        aggregator.add(analysis)
+    students_analysis = aggregator.by_name()
+    
+    payload = json.dumps(build_report_payload(students_analysis), ensure_ascii=False, separators=(',', ':'))
+    if sidecar:
+        # A script rather than a .json file, so the report still works when opened from disk
+        data_name = os.path.splitext(os.path.basename(output_path))[0] + '-data.js'
+        with open(os.path.join(os.path.dirname(output_path), data_name), 'w', encoding='utf-8') as f:
+            f.write(f"window.REPORT_DATA = {payload};\n")
+        data_script = template('sidecar_script').render({'src': data_name})
+    else:
+        # "</" would end the script element early
+        data_script = template('json_island').render({'payload': payload.replace('</', '<\\/')})
+    
+    generated = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        write = f.write
+        render_page_head(write, FINAL_STYLESHEET + VIRTUAL_STYLESHEET,
+                         template('final_header').render({'generated': generated}), VIEWPORT_META, stylesheet_href)
+        render_summary_stats(write, [
+            (len(aggregator), 'Total Students'),
+            (len(aggregator.subjects), 'Unique Subjects'),
+            (aggregator.totals['exceeding'], 'Exceeding Targets'),
+            (aggregator.totals['below'], 'Below Targets')
+        ])
+        template('virtual_list').write(write, {'data_script': data_script})
+        template('final_footer').write(write, {
+            'generated': generated,
+            'students': len(aggregator),
+            'subjects': len(aggregator.subjects)
+        })
     
     return students_analysis
 
-def generate_excel_report(students_analysis):
+@lru_cache(maxsize=None)
+def _excel_header_style() -> Dict:
+    """Header formats, built once and shared by every header cell of every workbook"""
+    from openpyxl.styles import Alignment, Border, Font, Side
+    
+    thin = Side(style='thin')
+    return {
+        'font': Font(bold=True),
+        'border': Border(left=thin, right=thin, top=thin, bottom=thin),
+        'alignment': Alignment(horizontal='center', vertical='top')
+    }
+
+def _header_cells(sheet, titles: List[str]) -> list:
+    """Header row cells carrying the shared header formats"""
+    from openpyxl.cell import WriteOnlyCell
+    
+    style = _excel_header_style()
+    cells = []
+    for title in titles:
+        cell = WriteOnlyCell(sheet, value=title)
+        cell.font = style['font']
+        cell.border = style['border']
+        cell.alignment = style['alignment']
+        cells.append(cell)
+    return cells
+
+def generate_excel_report(students_analysis: Iterable[Dict], output_path='Final_Student_Grade_Report.xlsx'):
     """Generate comprehensive Excel report"""
     try:
-        with pd.ExcelWriter('Final_Student_Grade_Report.xlsx', engine='openpyxl') as writer:
-            
-            # Summary sheet
-            summary_data = []
-            for student in students_analysis:
-                summary_data.append({
-                    'Student Name': student['name'],
-                    'School': student['school'],
-                    'Year': student['year'],
-                    'Total Subjects': len(student['subjects']),
-                    'Exceeding Target': student['exceeding'],
-                    'Meeting Target': student['meeting'],
-                    'Below Target': student['below'],
-                    'Priority Level': student['priority'].title(),
-                    'Needs Attention': 'Yes' if student['below'] >= 2 else 'No'
-                })
-            
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Student Summary', index=False)
-            
-            # Detailed grades sheet
-            detailed_data = []
-            for student in students_analysis:
-                for subject_info in student['subjects']:
-                    detailed_data.append({
-                        'Student Name': student['name'],
-                        'School': student['school'],
-                        'Year': student['year'],
-                        'Subject': subject_info['subject'],
-                        'Current Grade': subject_info['current'],
-                        'Target Grade': subject_info['predicted'],
-                        'Status': subject_info['status'],
-                        'Priority Level': student['priority'].title()
-                    })
-            
-            detailed_df = pd.DataFrame(detailed_data)
-            detailed_df.to_excel(writer, sheet_name='All Grades', index=False)
+        from openpyxl import Workbook
+        
+        # Write-only sheets stream rows to disk as they are appended
+        workbook = Workbook(write_only=True)
+        summary_sheet = workbook.create_sheet('Student Summary')
+        summary_sheet.append(_header_cells(summary_sheet, EXCEL_SUMMARY_COLUMNS))
+        grades_sheet = workbook.create_sheet('All Grades')
+        grades_sheet.append(_header_cells(grades_sheet, EXCEL_GRADES_COLUMNS))
+        priority_sheet = None
+        
+        # One pass fills all three sheets, so the analyses can come from a stream
+        for student in students_analysis:
+            name, school, year = student['name'], student['school'], student['year']
+            priority = student['priority'].title()
+            needs_attention = student['below'] >= 2
             
-            # Priority students sheet
-            priority_data = []
-            for student in students_analysis:
-                if student['below'] >= 2:
-                    for subject_info in student['subjects']:
-                        if 'Below' in subject_info['status']:
-                            priority_data.append({
-                                'Student Name': student['name'],
-                                'School': student['school'],
-                                'Year': student['year'],
-                                'Subject': subject_info['subject'],
-                                'Current Grade': subject_info['current'],
-                                'Target Grade': subject_info['predicted'],
-                                'Grade Gap': f"{subject_info['current']} → {subject_info['predicted']}",
-                                'Action Required': 'High' if student['priority'] == 'high' else 'Medium'
-                            })
+            summary_sheet.append([
+                name, school, year, len(student['subjects']),
+                student['exceeding'], student['meeting'], student['below'],
+                priority, 'Yes' if needs_attention else 'No'
+            ])
             
-            if priority_data:
-                priority_df = pd.DataFrame(priority_data)
-                priority_df.to_excel(writer, sheet_name='Priority Students', index=False)
-        
-        print("✅ Excel Report generated: Final_Student_Grade_Report.xlsx")
+            for subject_info in student['subjects']:
+                grades_sheet.append([
+                    name, school, year, subject_info['subject'],
+                    subject_info['current'], subject_info['predicted'], subject_info['status'], priority
+                ])
+                
+                if needs_attention and 'Below' in subject_info['status']:
+                    # Only created once there is a row for it, as before
+                    if priority_sheet is None:
+                        priority_sheet = workbook.create_sheet('Priority Students')
+                        priority_sheet.append(_header_cells(priority_sheet, EXCEL_PRIORITY_COLUMNS))
+                    priority_sheet.append([
+                        name, school, year, subject_info['subject'],
+                        subject_info['current'], subject_info['predicted'],
+                        f"{subject_info['current']} → {subject_info['predicted']}",
+                        'High' if student['priority'] == 'high' else 'Medium'
+                    ])
         
+        workbook.save(output_path)
+        print(f"✅ Excel Report generated: {output_path}")
+    
     except Exception as e:
         print(f"Error generating Excel report: {e}")
 
+def generate_sharded_excel_reports(students_analysis: List[Dict], output_dir='excel_reports', by_year=False,
+                                   workers: Optional[int] = None) -> List[Dict]:
+    """Write one workbook per school (and year) across a process pool, plus an index workbook of totals"""
+    groups = {}
+    for student in students_analysis:
+        key = (str(student['school']), str(student['year'])) if by_year else (str(student['school']),)
+        groups.setdefault(key, []).append(student)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    used_slugs = set()
+    shards = []
+    for group, students in sorted(groups.items()):
+        shards.append({
+            'group': group,
+            'path': os.path.join(output_dir, f"{_group_slug(group, used_slugs)}.xlsx"),
+            'students': students
+        })
+    
+    # Each partition is independent, so workbooks are written side by side
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(generate_excel_report, [s['students'] for s in shards], [s['path'] for s in shards]))
+    else:
+        for shard in shards:
+            generate_excel_report(shard['students'], shard['path'])
+    
+    summaries = []
+    for shard in shards:
+        students = shard['students']
+        summaries.append({
+            'group': shard['group'],
+            'workbook': os.path.basename(shard['path']),
+            'students': len(students),
+            'subjects': sum(len(s['subjects']) for s in students),
+            'exceeding': sum(s['exceeding'] for s in students),
+            'meeting': sum(s['meeting'] for s in students),
+            'below': sum(s['below'] for s in students),
+            'high_priority': sum(1 for s in students if s['priority'] == 'high')
+        })
+    
+    write_excel_index(summaries, os.path.join(output_dir, EXCEL_INDEX_FILE), by_year)
+    return summaries
+
+def write_excel_index(summaries: List[Dict], output_path: str, by_year=False):
+    """Small workbook listing each partition's workbook and counts, with cross-school totals"""
+    from openpyxl import Workbook
+    
+    counts = ('students', 'subjects', 'exceeding', 'meeting', 'below', 'high_priority')
+    group_columns = ['School', 'Year'] if by_year else ['School']
+    
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Index')
+    sheet.append(_header_cells(sheet, group_columns + EXCEL_INDEX_COLUMNS))
+    for summary in summaries:
+        sheet.append(list(summary['group']) + [summary['workbook']] + [summary[key] for key in counts])
+    
+    totals_label = ['All Schools'] + [''] * (len(group_columns) - 1) + ['']
+    sheet.append(_header_cells(sheet, totals_label + [sum(s[key] for s in summaries) for key in counts]))
+    
+    workbook.save(output_path)
+    print(f"✅ Excel index generated: {output_path}")
+
 def main():
     """Main function to generate final reports"""
+    parser = argparse.ArgumentParser(description="Generate the final HTML and Excel grade reports")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Processes for card rendering and per-school workbooks; above 1, large reports "
+                             "render cards in parallel instead of reusing cached ones")
+    parser.add_argument('--shared-css', action='store_true', help="Link a content-hashed report.css instead of inlining styles")
+    parser.add_argument('--precompress', action='store_true', help="Also write .gz copies of the HTML, search script and stylesheet")
+    parser.add_argument('--brotli', action='store_true', help="With --precompress, also write .br copies (needs brotli)")
+    parser.add_argument('--school-workbooks', action='store_true', help="Also write one Excel workbook per school plus an index")
+    parser.add_argument('--by-year', action='store_true', help="With --school-workbooks, split each school's workbook by year")
+    args = parser.parse_args()
+    
     print("🎓 GENERATING FINAL GRADE ANALYSIS REPORTS")
     print("=" * 70)
     
     try:
-        # Load and standardize data
-        df = pd.read_excel('KOC Grade Tracker Form(1-52).xlsx', sheet_name='Sheet1')
-        standardizer = ImprovedGradeStandardizer()
-        standardized_data = standardizer.process_all_data(df)
-        
-        print(f"✅ Standardized data for {len(standardized_data)} students")
+        # Load the saved records when they match the workbook, otherwise standardize
+        standardized_data = load_records(RECORDS_FILE, records_source_tag(TRACKER_FILE, TRACKER_SHEET))
+        if standardized_data is not None:
+            print(f"✅ Loaded standardized data for {len(standardized_data)} students from {RECORDS_FILE}")
+        else:
+            standardizer = ImprovedGradeStandardizer()
+            standardized_data = standardizer.process_all_data(load_tracker_rows(TRACKER_FILE, TRACKER_SHEET), state_path=STATE_FILE)
+            print(f"✅ Standardized data for {len(standardized_data)} students")
         
         # Generate HTML report
         print("📄 Generating HTML report...")
-        students_analysis = generate_comprehensive_html_report(standardized_data)
+        assets = ['index.html', 'index-search.js']
+        href = None
+        if args.shared_css:
+            stylesheet = write_shared_stylesheet('.')
+            assets.append(stylesheet)
+            href = stylesheet_href(stylesheet, '.')
+        if args.workers > 1:
+            students_analysis = generate_comprehensive_html_report(standardized_data, stylesheet_href=href,
+                                                                   workers=args.workers)
+        else:
+            fragment_cache = FragmentCache()
+            students_analysis = generate_comprehensive_html_report(standardized_data, fragment_cache=fragment_cache,
+                                                                   stylesheet_href=href)
+            print(f"   Student cards reused: {fragment_cache.hits}, re-rendered: {fragment_cache.misses}")
         print("✅ HTML Report generated: Final_Student_Grade_Report.html")
         
         # Generate Excel report
         print("📊 Generating Excel report...")
         generate_excel_report(students_analysis)
+        if args.school_workbooks:
+            summaries = generate_sharded_excel_reports(students_analysis, by_year=args.by_year, workers=args.workers)
+            print(f"✅ {len(summaries)} per-school workbooks written to excel_reports/")
+        
+        if args.precompress:
+            print(f"🗜️ Precompressed {len(precompress(assets, args.brotli))} files")
         
         print(f"\n🎉 REPORTS GENERATED SUCCESSFULLY!")
         print("=" * 70)
         print("📁 Files created:")
         print("   📄 index.html - Beautiful web report")
         print("   📊 Final_Student_Grade_Report.xlsx - Comprehensive Excel analysis")
+        if args.school_workbooks:
+            print("   📁 excel_reports/ - One workbook per school, plus an index")
         print("\n💡 Share these files with your team - no technical knowledge required!")
-        
+    
     except Exception as e:
         print(f"Error: {e}")
         import traceback
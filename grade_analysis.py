@@ -1,6 +1,21 @@
 import pandas as pd
 import re
 from typing import Dict, List, Tuple
+from grade_scales import (BELOW, CURRENT_ONLY, DIFFERENT_SYSTEMS, EXCEEDING, MEETING, NO_DATA,
+                          SAME_GRADE, TARGET_SET, compare_grade_status)
+from tracker_loader import TRACKER_FILE, TRACKER_SHEET, load_tracker_rows
+
+# Table wording for each grade comparison outcome
+STATUS_LABELS = {
+    NO_DATA: "",
+    TARGET_SET: "🎯 Target Set",
+    CURRENT_ONLY: "📈 Current Only",
+    EXCEEDING: "🎉 Exceeding",
+    MEETING: "✅ On Track",
+    BELOW: "⚠️ Below Target",
+    SAME_GRADE: "✅ On Track",
+    DIFFERENT_SYSTEMS: "📊 Compare"
+}
 
 def parse_grades(grade_text: str) -> Dict[str, str]:
     """Parse grade text and extract subject-grade pairs"""
@@ -51,19 +66,13 @@ def analyze_grades():
     """Analyze grades from the Excel file"""
     try:
         # Read the grade tracker file
-        df = pd.read_excel('KOC Grade Tracker Form(1-52).xlsx', sheet_name='Sheet1')
+        rows = load_tracker_rows(TRACKER_FILE, TRACKER_SHEET)
         
         print("=== UK STUDENT GRADE ANALYSIS ===\n")
         print("Comparing Current Grades vs Predicted/Aspiring Grades\n")
         print("=" * 80)
         
-        for index, row in df.iterrows():
-            name = row['Full Name']
-            school = row['School You Attend']
-            year = row['What year are you in']
-            current_grades_text = row['Please list all the subjects you are currently taking and your current grades']
-            predicted_grades_text = row['Please list all your predicted grades for each subject']
-            
+        for name, school, year, current_grades_text, predicted_grades_text in rows:
             if pd.isna(name) or name.strip() == '':
                 continue
                 
@@ -96,29 +105,7 @@ def analyze_grades():
                 predicted = predicted_grades.get(subject, 'N/A')
                 
                 # Determine status
-                status = ""
-                if current != 'N/A' and predicted != 'N/A':
-                    if current == predicted:
-                        status = "✅ On Track"
-                    else:
-                        # Simple comparison for UK grades (A* > A > B > C > D > E > U)
-                        uk_grades = ['U', 'E', 'D', 'C', 'B', 'A', 'A*']
-                        try:
-                            current_val = uk_grades.index(current) if current in uk_grades else -1
-                            predicted_val = uk_grades.index(predicted) if predicted in uk_grades else -1
-                            
-                            if current_val > predicted_val:
-                                status = "🎉 Exceeding"
-                            elif current_val < predicted_val:
-                                status = "⚠️ Below Target"
-                            else:
-                                status = "✅ On Track"
-                        except:
-                            status = "📊 Compare"
-                elif current != 'N/A':
-                    status = "📈 Current Only"
-                elif predicted != 'N/A':
-                    status = "🎯 Target Set"
+                status = STATUS_LABELS[compare_grade_status(current, predicted)]
                 
                 print(f"{subject:<25} {current:<12} {predicted:<12} {status}")
             
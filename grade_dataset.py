@@ -0,0 +1,82 @@
+import shutil
+from atomic_files import atomic_path
+from typing import Dict, List, Optional
+
+# Columnar copy of standardized_grades.json, one directory per year group
+DATASET_DIR = 'standardized_grades_dataset'
+DATASET_FORMATS = {'parquet': 'parquet', 'arrow': 'ipc'}
+
+# School, subject and grade repeat on almost every row, so they are stored as
+# dictionary indices; the year is the partition key and is not stored per row
+DICTIONARY_COLUMNS = ('school', 'subject', 'current', 'predicted')
+
+def _require_pyarrow():
+    """The pyarrow module, with an install hint when it is missing"""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("The columnar grade dataset needs pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+def grade_table(standardized_data: List[Dict]):
+    """Long-format student × subject table; students without subjects keep one row with no subject"""
+    pa = _require_pyarrow()
+    
+    columns = {name: [] for name in ('student', 'name', 'school', 'year', 'subject', 'current', 'predicted')}
+    for i, student in enumerate(standardized_data):
+        entries = list(student['subjects'].items()) or [(None, {'current': None, 'predicted': None})]
+        for subject, grades in entries:
+            columns['student'].append(i)
+            columns['name'].append(str(student['name']))
+            columns['school'].append(str(student['school']))
+            columns['year'].append(str(student['year']))
+            columns['subject'].append(subject)
+            columns['current'].append(grades['current'])
+            columns['predicted'].append(grades['predicted'])
+    
+    arrays = {}
+    for name, values in columns.items():
+        array = pa.array(values, type=pa.int32() if name == 'student' else pa.string())
+        arrays[name] = array.dictionary_encode() if name in DICTIONARY_COLUMNS else array
+    return pa.table(arrays)
+
+def write_grade_dataset(standardized_data: List[Dict], path: str = DATASET_DIR, fmt: str = 'parquet') -> str:
+    """Write the grade table as Parquet or Arrow files partitioned by year group"""
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+    
+    if fmt not in DATASET_FORMATS:
+        raise ValueError(f"Unknown dataset format {fmt!r}; expected one of {sorted(DATASET_FORMATS)}")
+    
+    # Written aside and swapped in, so year groups dropped since the last run do not linger
+    with atomic_path(path) as temp_path:
+        ds.write_dataset(grade_table(standardized_data), temp_path, format=DATASET_FORMATS[fmt],
+                         partitioning=ds.partitioning(pa.schema([('year', pa.string())]), flavor='hive'))
+        # A directory cannot be replaced while it has contents
+        shutil.rmtree(path, ignore_errors=True)
+    return path
+
+def load_grade_table(path: str = DATASET_DIR, year: Optional[str] = None, fmt: str = 'parquet'):
+    """Memory-mapped read of the grade table, optionally of a single year group"""
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+    
+    dataset = ds.dataset(path, format=DATASET_FORMATS[fmt], filesystem=fs.LocalFileSystem(use_mmap=True),
+                         partitioning=ds.partitioning(pa.schema([('year', pa.string())]), flavor='hive'))
+    
+    # Only the matching partition directory is opened when a year is given
+    table = dataset.to_table(filter=ds.field('year') == year if year is not None else None)
+    return table.sort_by('student')
+
+def standardized_from_table(table) -> List[Dict]:
+    """The nested student records the report scripts take, rebuilt from a grade table"""
+    students = []
+    last_student = None
+    for row in table.to_pylist():
+        if row['student'] != last_student:
+            last_student = row['student']
+            students.append({'name': row['name'], 'school': row['school'], 'year': row['year'], 'subjects': {}})
+        if row['subject'] is not None:
+            students[-1]['subjects'][row['subject']] = {'current': row['current'], 'predicted': row['predicted']}
+    return students
\ No newline at end of file
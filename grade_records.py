@@ -0,0 +1,137 @@
+import gc
+import struct
+import sys
+from array import array
+from atomic_files import atomic_write
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+# Binary copy of standardized_grades.json, written next to it
+RECORDS_FILE = 'standardized_grades.grdb'
+
+RECORDS_MAGIC = b'GRDB'
+RECORDS_VERSION = 1
+
+# Magic, version, string count, string blob bytes, student count, subject entry count
+_HEADER = struct.Struct('<4sHIIII')
+
+# Per student: name, school, year, raw_current, raw_predicted, subject count.
+# Per subject entry: subject, current, predicted. All but the count are string references.
+_STUDENT_WIDTH = 6
+_SUBJECT_WIDTH = 3
+_RAW_FIELDS = ('raw_current', 'raw_predicted')
+
+# Reference stored for a raw text field the record does not have
+_MISSING = 0xFFFFFFFF
+
+# Arrays are stored little-endian
+_SWAP = sys.byteorder == 'big'
+
+def _to_bytes(values: array) -> bytes:
+    if _SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def encode_records(standardized_data: List[Dict], source_tag: str = '') -> bytes:
+    """Student records as integer references into one shared, de-duplicated string table"""
+    strings = {}
+    def ref(text: str) -> int:
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+    
+    # String 0 records what the data was standardized from, so stale files can be spotted
+    ref(source_tag)
+    
+    students = array('I')
+    subjects = array('I')
+    for student in standardized_data:
+        students.extend((ref(student['name']), ref(student['school']), ref(student['year'])))
+        students.extend(ref(student[field]) if field in student else _MISSING for field in _RAW_FIELDS)
+        students.append(len(student['subjects']))
+        for subject, grades in student['subjects'].items():
+            subjects.extend((ref(subject), ref(grades['current']), ref(grades['predicted'])))
+    
+    # Strings are stored as one UTF-8 blob plus their lengths in characters
+    lengths = array('I', map(len, strings))
+    blob = ''.join(strings).encode('utf-8', 'surrogatepass')
+    header = _HEADER.pack(RECORDS_MAGIC, RECORDS_VERSION, len(strings), len(blob),
+                          len(students) // _STUDENT_WIDTH, len(subjects) // _SUBJECT_WIDTH)
+    return b''.join((header, _to_bytes(lengths), _to_bytes(students), _to_bytes(subjects), blob))
+
+def decode_records(data: bytes) -> Tuple[str, List[Dict]]:
+    """The source tag and the student records, in the JSON schema they were encoded from"""
+    magic, version, string_count, blob_size, student_count, subject_count = _HEADER.unpack_from(data)
+    if magic != RECORDS_MAGIC or version != RECORDS_VERSION:
+        raise ValueError(f"Not a version {RECORDS_VERSION} grade records file")
+    
+    offset = _HEADER.size
+    def take(count: int) -> List[int]:
+        nonlocal offset
+        values = array('I')
+        values.frombytes(data[offset:offset + count * values.itemsize])
+        offset += count * values.itemsize
+        if _SWAP:
+            values.byteswap()
+        return values.tolist()
+    
+    lengths = take(string_count)
+    students = take(student_count * _STUDENT_WIDTH)
+    subjects = take(subject_count * _SUBJECT_WIDTH)
+    if len(data) != offset + blob_size:
+        raise ValueError("Truncated grade records file")
+    
+    text = data[offset:].decode('utf-8', 'surrogatepass')
+    ends = list(accumulate(lengths))
+    strings = [text[end - length:end] for end, length in zip(ends, lengths)]
+    
+    # Building this many dicts otherwise sets off repeated collections that rescan
+    # every record made so far; none of them can be part of a reference cycle
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        records = _build_records(strings, students, subjects)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return strings[0], records
+
+def _build_records(strings: List[str], students: List[int], subjects: List[int]) -> List[Dict]:
+    """Nested student records from the decoded string table and reference arrays"""
+    records = []
+    entry = 0
+    for i in range(0, len(students), _STUDENT_WIDTH):
+        name, school, year, raw_current, raw_predicted, count = students[i:i + _STUDENT_WIDTH]
+        student_subjects = {}
+        for j in range(entry * _SUBJECT_WIDTH, (entry + count) * _SUBJECT_WIDTH, _SUBJECT_WIDTH):
+            student_subjects[strings[subjects[j]]] = {
+                'current': strings[subjects[j + 1]],
+                'predicted': strings[subjects[j + 2]]
+            }
+        entry += count
+        
+        record = {'name': strings[name], 'school': strings[school], 'year': strings[year],
+                  'subjects': student_subjects}
+        for field, ref in zip(_RAW_FIELDS, (raw_current, raw_predicted)):
+            if ref != _MISSING:
+                record[field] = strings[ref]
+        records.append(record)
+    return records
+
+def save_records(standardized_data: List[Dict], path: str = RECORDS_FILE, source_tag: str = ''):
+    """Write the binary records, via a temp file so readers never see a partial one"""
+    with atomic_write(path) as f:
+        f.write(encode_records(standardized_data, source_tag))
+
+def load_records(path: str = RECORDS_FILE, source_tag: Optional[str] = None) -> Optional[List[Dict]]:
+    """Saved records, or None if the file is missing, unreadable or was written from other data"""
+    try:
+        with open(path, 'rb') as f:
+            tag, records = decode_records(f.read())
+    except (OSError, ValueError, struct.error, IndexError):
+        return None
+    
+    if source_tag is not None and tag != source_tag:
+        return None
+    return records
\ No newline at end of file
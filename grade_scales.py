@@ -0,0 +1,150 @@
+from itertools import product
+from typing import Dict, List, Sequence, Tuple
+
+# Grade scales
+GCSE, A_LEVEL, BTEC, BTEC_COMBINED, LEVEL = range(5)
+SCALE_NAMES = ('GCSE', 'A-Level', 'BTEC', 'Combined BTEC', 'Level')
+
+# Outcomes of comparing a current grade with a predicted one
+(NO_DATA, TARGET_SET, CURRENT_ONLY, EXCEEDING, MEETING, BELOW,
+ SAME_GRADE, DIFFERENT_SYSTEMS) = range(8)
+
+# Codes 0 and 1 are reserved; real grades are numbered from 2
+NA_CODE = 0
+UNKNOWN_CODE = 1
+
+# Points within each scale. A grade listed in more than one scale ('U', 'D')
+# belongs to the first scale it appears in, in this order.
+_SCALE_POINTS = (
+    (GCSE, {'9': 9, '8': 8, '7': 7, '6': 6, '5': 5, '4': 4, '3': 3, '2': 2, '1': 1, 'U': 0}),
+    (A_LEVEL, {'A*': 6, 'A': 5, 'B': 4, 'C': 3, 'D': 2, 'E': 1, 'U': 0}),
+    (BTEC, {'D*': 4, 'DISTINCTION*': 4, 'D': 3, 'DISTINCTION': 3, 'M': 2, 'MERIT': 2, 'P': 1, 'PASS': 1}),
+    (LEVEL, {'L1': 1, 'L2': 2, 'L3': 3}),
+)
+
+# Each scale's own grades, for comparisons that never rank one scale against another
+_POINTS_BY_SCALE = dict(_SCALE_POINTS)
+
+# Combined BTEC grades (DMM, DD*, ...) score the sum of their components
+_BTEC_UNITS = {'D*': 4, 'D': 3, 'M': 2, 'P': 1}
+_COMBINED_LENGTHS = (2, 3)
+
+# Single grades on these scales are compared on raw points even across scales,
+# as the reports always have; the other scales only compare within themselves
+_POINTS_ACROSS_SCALES = {GCSE, A_LEVEL, BTEC}
+
+def _build_registry() -> Tuple[Dict[str, int], List[int], List[int], List[str]]:
+    """Number every known grade and record its scale and points"""
+    codes = {}
+    scales = [-1, -1]
+    points = [-1, -1]
+    names = ['N/A', '?']
+    
+    def add(grade: str, scale: int, value: int):
+        if grade in codes:
+            return
+        codes[grade] = len(names)
+        scales.append(scale)
+        points.append(value)
+        names.append(grade)
+    
+    for scale, grade_points in _SCALE_POINTS:
+        for grade, value in grade_points.items():
+            add(grade, scale, value)
+    
+    for length in _COMBINED_LENGTHS:
+        for units in product(_BTEC_UNITS, repeat=length):
+            add(''.join(units), BTEC_COMBINED, sum(_BTEC_UNITS[unit] for unit in units))
+    
+    return codes, scales, points, names
+
+_GRADE_CODES, GRADE_SCALES, GRADE_POINTS, GRADE_NAMES = _build_registry()
+
+# Lookup keys include the spellings reports actually see ('Merit', 'a*'),
+# so most grades resolve without uppercasing
+_LOOKUP = {'N/A': NA_CODE}
+for _grade, _code in _GRADE_CODES.items():
+    for _spelling in (_grade, _grade.lower(), _grade.title()):
+        _LOOKUP.setdefault(_spelling, _code)
+
+def _build_status_table() -> List[List[int]]:
+    """Comparison outcome for every (current code, predicted code) pair"""
+    size = len(GRADE_NAMES)
+    table = [[DIFFERENT_SYSTEMS] * size for _ in range(size)]
+    
+    for current in range(size):
+        for predicted in range(size):
+            if current == NA_CODE and predicted == NA_CODE:
+                status = NO_DATA
+            elif current == NA_CODE:
+                status = TARGET_SET
+            elif predicted == NA_CODE:
+                status = CURRENT_ONLY
+            elif current == UNKNOWN_CODE or predicted == UNKNOWN_CODE:
+                # Unrecognised grades are only settled by comparing the text
+                status = DIFFERENT_SYSTEMS
+            elif (GRADE_SCALES[current] != GRADE_SCALES[predicted]
+                  and not {GRADE_SCALES[current], GRADE_SCALES[predicted]} <= _POINTS_ACROSS_SCALES):
+                status = DIFFERENT_SYSTEMS
+            elif GRADE_POINTS[current] > GRADE_POINTS[predicted]:
+                status = EXCEEDING
+            elif GRADE_POINTS[current] == GRADE_POINTS[predicted]:
+                status = MEETING
+            else:
+                status = BELOW
+            table[current][predicted] = status
+    
+    return table
+
+STATUS_TABLE = _build_status_table()
+
+def grade_code(grade: str) -> int:
+    """Registry code of a grade, UNKNOWN_CODE if it is not on any scale"""
+    code = _LOOKUP.get(grade)
+    if code is None:
+        code = _LOOKUP.get(str(grade).upper().strip(), UNKNOWN_CODE)
+    return code
+
+def grade_scale(grade: str) -> int:
+    """Scale ID of a grade, or -1 for N/A and unrecognised grades"""
+    return GRADE_SCALES[grade_code(grade)]
+
+def grade_points(grade: str) -> int:
+    """Points of a grade within its scale, or -1 for N/A and unrecognised grades"""
+    return GRADE_POINTS[grade_code(grade)]
+
+def compare_codes(current: int, predicted: int, current_text: str = '', predicted_text: str = '') -> int:
+    """Comparison outcome for two grade codes"""
+    if current == UNKNOWN_CODE and predicted == UNKNOWN_CODE:
+        return SAME_GRADE if current_text.upper() == predicted_text.upper() else DIFFERENT_SYSTEMS
+    return STATUS_TABLE[current][predicted]
+
+def compare_grade_status(current: str, predicted: str) -> int:
+    """Comparison outcome for a current and predicted grade"""
+    return compare_codes(grade_code(current), grade_code(predicted), current, predicted)
+
+def compare_within_scales(current: str, predicted: str, scales: Sequence[int] = (GCSE, A_LEVEL, BTEC)) -> int:
+    """Comparison outcome ranking the grades only on the first of scales that has both
+    
+    Unlike compare_grade_status, grades on different scales are never ranked
+    against each other, and an ambiguous grade takes its meaning from the
+    other grade: 'D' is an A-Level D against 'B' but a BTEC Distinction
+    against 'M'.
+    """
+    current_code = grade_code(current)
+    predicted_code = grade_code(predicted)
+    if NA_CODE in (current_code, predicted_code):
+        return STATUS_TABLE[current_code][predicted_code]
+    
+    current_key = str(current).upper().strip()
+    predicted_key = str(predicted).upper().strip()
+    for scale in scales:
+        grade_points = _POINTS_BY_SCALE[scale]
+        if current_key in grade_points and predicted_key in grade_points:
+            if grade_points[current_key] > grade_points[predicted_key]:
+                return EXCEEDING
+            if grade_points[current_key] == grade_points[predicted_key]:
+                return MEETING
+            return BELOW
+    
+    return SAME_GRADE if current_key == predicted_key else DIFFERENT_SYSTEMS
\ No newline at end of file
@@ -0,0 +1,219 @@
+import argparse
+import os
+import sqlite3
+from atomic_files import atomic_path
+from typing import Dict, Iterable, List, Optional
+from generate_final_reports import iter_student_analyses
+
+# Optional queryable copy of the analysed grades
+STORE_FILE = 'grade_store.sqlite3'
+
+_SCHEMA = """
+CREATE TABLE schools (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE subjects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE statuses (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE,
+    color TEXT NOT NULL,
+    icon TEXT NOT NULL
+);
+CREATE TABLE students (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    school_id INTEGER NOT NULL REFERENCES schools(id),
+    year TEXT NOT NULL,
+    exceeding INTEGER NOT NULL,
+    meeting INTEGER NOT NULL,
+    below INTEGER NOT NULL,
+    priority TEXT NOT NULL
+);
+CREATE TABLE grades (
+    student_id INTEGER NOT NULL REFERENCES students(id),
+    position INTEGER NOT NULL,
+    subject_id INTEGER NOT NULL REFERENCES subjects(id),
+    current TEXT NOT NULL,
+    predicted TEXT NOT NULL,
+    status_id INTEGER NOT NULL REFERENCES statuses(id),
+    PRIMARY KEY (student_id, position)
+);
+"""
+
+# Built after the bulk insert, which is faster than maintaining them row by row
+_INDEXES = """
+CREATE INDEX students_school_year ON students(school_id, year);
+CREATE INDEX students_year ON students(year);
+CREATE INDEX students_name ON students(name);
+CREATE INDEX grades_subject_status ON grades(subject_id, status_id);
+CREATE INDEX grades_status ON grades(status_id);
+"""
+
+def save_grade_store(standardized_data: Iterable[Dict], path: str = STORE_FILE) -> int:
+    """Rebuild the store from standardized data in one transaction; returns the students stored"""
+    # Built aside and swapped in, so queries never see a half-written store
+    with atomic_path(path) as temp_path:
+        connection = sqlite3.connect(temp_path)
+        try:
+            # The temp file is discarded on failure, so there is nothing to journal
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.executescript(_SCHEMA)
+            
+            lookups = {'schools': {}, 'subjects': {}, 'statuses': {}}
+            def lookup_id(table: str, key) -> int:
+                ids = lookups[table]
+                if key not in ids:
+                    ids[key] = len(ids) + 1
+                return ids[key]
+            
+            students = []
+            grades = []
+            for student_id, student in enumerate(iter_student_analyses(standardized_data), 1):
+                students.append((student_id, student['name'], lookup_id('schools', student['school']), student['year'],
+                                 student['exceeding'], student['meeting'], student['below'], student['priority']))
+                for position, subject_info in enumerate(student['subjects']):
+                    status = (subject_info['status'], subject_info['color'], subject_info['icon'])
+                    grades.append((student_id, position, lookup_id('subjects', subject_info['subject']),
+                                   subject_info['current'], subject_info['predicted'], lookup_id('statuses', status)))
+            
+            with connection:
+                connection.executemany("INSERT INTO schools VALUES (?, ?)",
+                                       ((i, name) for name, i in lookups['schools'].items()))
+                connection.executemany("INSERT INTO subjects VALUES (?, ?)",
+                                       ((i, name) for name, i in lookups['subjects'].items()))
+                connection.executemany("INSERT INTO statuses VALUES (?, ?, ?, ?)",
+                                       ((i, *status) for status, i in lookups['statuses'].items()))
+                connection.executemany("INSERT INTO students VALUES (?, ?, ?, ?, ?, ?, ?, ?)", students)
+                connection.executemany("INSERT INTO grades VALUES (?, ?, ?, ?, ?, ?)", grades)
+                connection.executescript(_INDEXES)
+            connection.execute("ANALYZE")
+        finally:
+            connection.close()
+    
+    return len(students)
+
+def query_students(path: str = STORE_FILE, school: Optional[str] = None, year: Optional[str] = None,
+                   subject: Optional[str] = None, status: Optional[str] = None, priority: Optional[str] = None,
+                   all_subjects: bool = False) -> List[Dict]:
+    """Analysis dicts of the students matching every given filter, sorted by name
+    
+    Subject and status filters also narrow each student's subjects to the
+    matching grades, unless all_subjects is set.
+    """
+    student_filters = []
+    grade_filters = []
+    params = []
+    if school is not None:
+        student_filters.append("st.school_id = (SELECT id FROM schools WHERE name = ?)")
+        params.append(school)
+    if year is not None:
+        student_filters.append("st.year = ?")
+        params.append(year)
+    if priority is not None:
+        student_filters.append("st.priority = ?")
+        params.append(priority)
+    
+    grade_params = []
+    if subject is not None:
+        grade_filters.append("g.subject_id = (SELECT id FROM subjects WHERE name = ?)")
+        grade_params.append(subject)
+    if status is not None:
+        grade_filters.append("g.status_id = (SELECT id FROM statuses WHERE label = ?)")
+        grade_params.append(status)
+    
+    if grade_filters and all_subjects:
+        student_filters.append("st.id IN (SELECT g.student_id FROM grades g WHERE "
+                               + " AND ".join(grade_filters) + ")")
+        params.extend(grade_params)
+    else:
+        student_filters.extend(grade_filters)
+        params.extend(grade_params)
+    
+    sql = """
+        SELECT st.id, st.name, sc.name, st.year, st.exceeding, st.meeting, st.below, st.priority,
+               su.name, g.current, g.predicted, ss.label, ss.color, ss.icon
+        FROM students st
+        JOIN schools sc ON sc.id = st.school_id
+        JOIN grades g ON g.student_id = st.id
+        JOIN subjects su ON su.id = g.subject_id
+        JOIN statuses ss ON ss.id = g.status_id
+    """
+    if student_filters:
+        sql += " WHERE " + " AND ".join(student_filters)
+    # Same order as ReportAggregator.by_name: by name, ties in arrival order
+    sql += " ORDER BY st.name, st.id, g.position"
+    
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute(sql, params).fetchall()
+    finally:
+        connection.close()
+    
+    students = []
+    last_id = None
+    for (student_id, name, school_name, student_year, exceeding, meeting, below, student_priority,
+         subject_name, current, predicted, label, color, icon) in rows:
+        if student_id != last_id:
+            last_id = student_id
+            students.append({
+                'name': name,
+                'school': school_name,
+                'year': student_year,
+                'subjects': [],
+                'exceeding': exceeding,
+                'meeting': meeting,
+                'below': below,
+                'priority': student_priority
+            })
+        students[-1]['subjects'].append({
+            'subject': subject_name,
+            'current': current,
+            'predicted': predicted,
+            'status': label,
+            'color': color,
+            'icon': icon
+        })
+    
+    return students
+
+def main():
+    """Query the grade store, building it from the tracker first if needed"""
+    parser = argparse.ArgumentParser(description="Ad-hoc queries over the SQLite grade store")
+    parser.add_argument('--db', default=STORE_FILE, help="Store location")
+    parser.add_argument('--rebuild', action='store_true', help="Re-standardize the tracker into the store first")
+    parser.add_argument('--school', help="Exact school name")
+    parser.add_argument('--year', help="Exact year group, e.g. 'Year 13'")
+    parser.add_argument('--subject', help="Standardized subject name, e.g. Chemistry")
+    parser.add_argument('--status', help="Status label, e.g. 'Below Target'")
+    parser.add_argument('--priority', choices=['low', 'medium', 'high'], help="Priority level")
+    parser.add_argument('--all-subjects', action='store_true', help="List every subject of each matching student")
+    args = parser.parse_args()
+    
+    if args.rebuild or not os.path.exists(args.db):
+        from improved_standardization import STATE_FILE, ImprovedGradeStandardizer
+        from tracker_loader import TRACKER_FILE, TRACKER_SHEET, load_tracker_rows
+        
+        print(f"🔧 Building {args.db} from {TRACKER_FILE}...")
+        ImprovedGradeStandardizer().process_all_data(load_tracker_rows(TRACKER_FILE, TRACKER_SHEET),
+                                                     state_path=STATE_FILE, store_path=args.db)
+    
+    students = query_students(args.db, args.school, args.year, args.subject, args.status, args.priority,
+                              args.all_subjects)
+    
+    print(f"\n🔎 {len(students)} matching students")
+    print("=" * 70)
+    for student in students:
+        print(f"\n👤 {student['name']} — {student['school']}, {student['year']} ({student['priority']} priority)")
+        for subject_info in student['subjects']:
+            print(f"   {subject_info['icon']} {subject_info['subject']}: {subject_info['current']} → "
+                  f"{subject_info['predicted']} ({subject_info['status']})")
+    
+    return students
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
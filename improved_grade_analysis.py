@@ -1,6 +1,21 @@
 import pandas as pd
 import re
 from typing import Dict, List, Tuple
+from grade_scales import (BELOW, CURRENT_ONLY, DIFFERENT_SYSTEMS, EXCEEDING, MEETING, NO_DATA,
+                          SAME_GRADE, TARGET_SET, compare_within_scales)
+from tracker_loader import TRACKER_FILE, TRACKER_SHEET, load_tracker_rows
+
+# Summary wording for each grade comparison outcome
+STATUS_LABELS = {
+    NO_DATA: "❓ No Data",
+    TARGET_SET: "🎯 Target Set",
+    CURRENT_ONLY: "📈 Current Only",
+    EXCEEDING: "🎉 Exceeding Target",
+    MEETING: "✅ On Track",
+    BELOW: "⚠️ Below Target",
+    SAME_GRADE: "✅ On Track",
+    DIFFERENT_SYSTEMS: "📊 Different Systems"
+}
 
 def clean_subject_name(subject: str) -> str:
     """Clean and standardize subject names"""
@@ -56,51 +71,12 @@ def parse_grades_improved(grade_text: str) -> Dict[str, str]:
 
 def compare_grades(current: str, predicted: str) -> str:
     """Compare UK grades and return status"""
-    if current == 'N/A' and predicted == 'N/A':
-        return "❓ No Data"
-    elif current == 'N/A':
-        return "🎯 Target Set"
-    elif predicted == 'N/A':
-        return "📈 Current Only"
-    
-    # UK GCSE grades: 9 > 8 > 7 > 6 > 5 > 4 > 3 > 2 > 1 > U
-    gcse_grades = {'U': 0, '1': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9}
-    
-    # UK A-Level grades: A* > A > B > C > D > E > U
-    alevel_grades = {'U': 0, 'E': 1, 'D': 2, 'C': 3, 'B': 4, 'A': 5, 'A*': 6}
-    
-    # BTEC grades: Distinction* > Distinction > Merit > Pass
-    btec_grades = {'Pass': 1, 'P': 1, 'Merit': 2, 'M': 2, 'Distinction': 3, 'D': 3, 'D*': 4, 'Distinction*': 4}
-    
-    current_val = None
-    predicted_val = None
-    
-    # Try to match grades in different systems
-    for grade_system in [gcse_grades, alevel_grades, btec_grades]:
-        if current in grade_system and predicted in grade_system:
-            current_val = grade_system[current]
-            predicted_val = grade_system[predicted]
-            break
-    
-    if current_val is not None and predicted_val is not None:
-        if current_val > predicted_val:
-            return "🎉 Exceeding Target"
-        elif current_val == predicted_val:
-            return "✅ On Track"
-        else:
-            return "⚠️ Below Target"
-    
-    # If we can't compare numerically, check if they're the same
-    if current.upper() == predicted.upper():
-        return "✅ On Track"
-    
-    return "📊 Different Systems"
+    # Grades are only ranked within one system; this parser leaves grades raw, so 'D' may be BTEC
+    return STATUS_LABELS[compare_within_scales(current, predicted)]
 
 def create_summary_report():
     """Create a comprehensive summary report"""
     try:
-        df = pd.read_excel('KOC Grade Tracker Form(1-52).xlsx', sheet_name='Sheet1')
-        
         print("🎓 UK STUDENT GRADE ANALYSIS SUMMARY")
         print("=" * 80)
         
@@ -112,18 +88,12 @@ def create_summary_report():
         
         detailed_results = []
         
-        for index, row in df.iterrows():
-            name = row['Full Name']
+        for name, school, year, current_grades_text, predicted_grades_text in load_tracker_rows(TRACKER_FILE, TRACKER_SHEET):
             if pd.isna(name) or name.strip() == '':
                 continue
                 
             total_students += 1
             
-            school = row['School You Attend']
-            year = row['What year are you in']
-            current_grades_text = row['Please list all the subjects you are currently taking and your current grades']
-            predicted_grades_text = row['Please list all your predicted grades for each subject']
-            
             current_grades = parse_grades_improved(current_grades_text)
             predicted_grades = parse_grades_improved(predicted_grades_text)
             
@@ -1,109 +1,192 @@
 import pandas as pd
 import re
-from typing import Dict, List, Tuple
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import json
+from types import MappingProxyType
+from functools import lru_cache
+from atomic_files import atomic_write
+from grade_dataset import DATASET_DIR, write_grade_dataset
+from grade_records import RECORDS_FILE, save_records
+from subject_matcher import SubjectKeywordMatcher
+from tracker_loader import (CURRENT_COLUMN, PREDICTED_COLUMN, TRACKER_FILE, TRACKER_SHEET,
+                            as_tracker_rows, load_tracker_rows, rows_from_dataframe, workbook_digest)
+
+# Single scan over a fragment: each match is one separator together with the whole run of
+# subject text before it and, via lookahead, the grade after it (left unconsumed so the
+# next subject run still starts right after the separator)
+_SEPARATOR_RE = re.compile(r"""
+    (?<![A-Z\s&'])[A-Z\s&']*
+    (?:
+        (?P<sep>[-–:])(?:(?=\s*(?P<grade>[A-Z*\d]+)))?
+      | (?P<open>\()(?:(?=(?P<paren_grade>[A-Z*\d]+)\)))?
+    )
+""", re.IGNORECASE | re.VERBOSE)
+
+_SINGLE_GRADE_RE = re.compile(r'^[A-Z*]{1,3}$')
+_SINGLE_DIGIT_RE = re.compile(r'^\d$')
+_COMMA_PAIR_RE = re.compile(r'[A-Za-z]+\s*,\s*[A-Za-z]+\s*-')
+# Subject clean-up: qualification prefixes/suffixes, trailing brackets, punctuation
+_SUBJECT_PREFIX_RE = re.compile(r'^(btec|level \d+|l\d+)\s*')
+_SUBJECT_SUFFIX_RE = re.compile(r'\s*(gcse|a-level|as)$')
+_SUBJECT_BRACKETS_RE = re.compile(r'\s*\([^)]*\)$')
+_SUBJECT_SPECIAL_RE = re.compile(r'[^\w\s&]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Raw spellings indexed for each alias, so common forms never reach the regex clean-up
+_ALIAS_PREFIXES = ('', 'btec ', 'l2 ', 'l3 ', 'level 2 ', 'level 3 ')
+_ALIAS_SUFFIXES = ('', ' gcse', ' a-level', ' as')
+
+# Shortest partial subject name that may be expanded to a longer alias
+_MIN_PREFIX_LENGTH = 3
+
+# A whole answer line the column-wide path can take: one "Subject - Grade" and nothing else
+_SIMPLE_LINE_PATTERN = r"([A-Z\s&']+?)\s*[-–]\s*([A-Z*\d]+)"
+
+# Whole answers that mean "no data"
+_BLANK_ANSWERS = ['nan', 'n/a', '-', 'na', '']
+
+_GRADE_RUN_RE = re.compile(r'[A-Z*\d]+', re.IGNORECASE)
+_GRADE_SEARCH_RE = re.compile(r'([A-Z*\d]+|Merit|Distinction|Pass|N/?A|NA)', re.IGNORECASE)
+
+# Watermark of already-standardized rows, used by incremental runs
+STATE_FILE = 'standardized_state.json'
 
 class ImprovedGradeStandardizer:
-    def __init__(self):
-        # Enhanced subject mappings with more variations
-        self.subject_mappings = {
-            # English variations
-            'english lit': 'English Literature',
-            'english literature': 'English Literature', 
-            'english lang': 'English Language',
-            'english language': 'English Language',
-            'english': 'English Language',
-            
-            # Maths variations
-            'maths': 'Mathematics',
-            'mathematics': 'Mathematics',
-            'math': 'Mathematics',
-            
-            # Sciences
-            'biology': 'Biology',
-            'chemistry': 'Chemistry', 
-            'physics': 'Physics',
-            'combined science': 'Combined Science',
-            'applied science': 'Applied Science',
-            'btec applied science': 'BTEC Applied Science',
-            'science': 'Science',
-            
-            # Social subjects
-            'history': 'History',
-            'geography': 'Geography',
-            'psychology': 'Psychology',
-            'sociology': 'Sociology',
-            'sociolgy': 'Sociology',  # Common typo
-            'socio': 'Sociology',
-            'religious studies': 'Religious Studies',
-            'religious study': 'Religious Studies',
-            're': 'Religious Studies',
-            'ethics': 'Ethics',
-            
-            # Business & Economics
-            'business': 'Business Studies',
-            'business studies': 'Business Studies',
-            'economics': 'Economics',
-            'criminology': 'Criminology',
-            'criminolgy': 'Criminology',  # Common typo
-            'finance': 'Finance',
-            
-            # Languages
-            'french': 'French',
-            'spanish': 'Spanish', 
-            'german': 'German',
-            
-            # Arts & Creative
-            'art': 'Art',
-            'music': 'Music',
-            'drama': 'Drama',
-            
-            # Technology & Computing
-            'ict': 'ICT',
-            'it': 'ICT',
-            'computing': 'Computing',
-            'creative computing': 'Creative Computing',
-            'computer science': 'Computer Science',
-            
-            # PE & Sports
-            'pe': 'Physical Education',
-            'physical education': 'Physical Education',
-            'sport': 'Sport',
-            'btec sport': 'BTEC Sport',
-            'sports': 'Sport',
-            
-            # Health & Social Care
-            'health and social care': 'Health & Social Care',
-            'health & social care': 'Health & Social Care',
-            'health and social': 'Health & Social Care',
-            'child development': 'Child Development',
-            'sports and nutrition': 'Sports & Nutrition',
-            
-            # Other subjects
-            'politics': 'Politics',
-            'media': 'Media Studies',
-            'law': 'Law',
-            'philosophy': 'Philosophy',
-            'engineering': 'Engineering'
-        }
+    # Bump whenever parsing or standardization output changes so stored results are discarded
+    STANDARDIZER_VERSION = 4
+    
+    # Enhanced subject mappings with more variations
+    # Read-only: the alias indexes and keyword matcher below are built from it once at import
+    SUBJECT_MAPPINGS = MappingProxyType({
+        # English variations
+        'english lit': 'English Literature',
+        'english literature': 'English Literature', 
+        'english lang': 'English Language',
+        'english language': 'English Language',
+        'english': 'English Language',
+        
+        # Maths variations
+        'maths': 'Mathematics',
+        'mathematics': 'Mathematics',
+        'math': 'Mathematics',
+        
+        # Sciences
+        'biology': 'Biology',
+        'chemistry': 'Chemistry', 
+        'physics': 'Physics',
+        'combined science': 'Combined Science',
+        'applied science': 'Applied Science',
+        'btec applied science': 'Applied Science',  # Same course as every other 'btec ... applied science' spelling
+        'science': 'Science',
+        
+        # Social subjects
+        'history': 'History',
+        'geography': 'Geography',
+        'psychology': 'Psychology',
+        'sociology': 'Sociology',
+        'sociolgy': 'Sociology',  # Common typo
+        'socio': 'Sociology',
+        'religious studies': 'Religious Studies',
+        'religious study': 'Religious Studies',
+        're': 'Religious Studies',
+        'ethics': 'Ethics',
+        
+        # Business & Economics
+        'business': 'Business Studies',
+        'business studies': 'Business Studies',
+        'economics': 'Economics',
+        'criminology': 'Criminology',
+        'criminolgy': 'Criminology',  # Common typo
+        'finance': 'Finance',
+        
+        # Languages
+        'french': 'French',
+        'spanish': 'Spanish', 
+        'german': 'German',
+        
+        # Arts & Creative
+        'art': 'Art',
+        'music': 'Music',
+        'drama': 'Drama',
+        
+        # Technology & Computing
+        'ict': 'ICT',
+        'it': 'ICT',
+        'computing': 'Computing',
+        'creative computing': 'Creative Computing',
+        'computer science': 'Computer Science',
+        
+        # PE & Sports
+        'pe': 'Physical Education',
+        'physical education': 'Physical Education',
+        'sport': 'Sport',
+        'btec sport': 'Sport',  # Same course as every other 'btec ... sport' spelling
+        'sports': 'Sport',
+        
+        # Health & Social Care
+        'health and social care': 'Health & Social Care',
+        'health & social care': 'Health & Social Care',
+        'health and social': 'Health & Social Care',
+        'child development': 'Child Development',
+        'sports and nutrition': 'Sports & Nutrition',
+        
+        # Other subjects
+        'politics': 'Politics',
+        'media': 'Media Studies',
+        'law': 'Law',
+        'philosophy': 'Philosophy',
+        'engineering': 'Engineering'
+    })
+    
+    def __init__(self, cache_size: Optional[int] = 4096):
+        # Class-level table and indexes, built once at import; the table is a read-only view
+        self.subject_mappings = self.SUBJECT_MAPPINGS
+        self.subject_matcher = self.SUBJECT_MATCHER
+        
+        # LRU caches keyed on normalised text; students often paste identical answers.
+        # cache_size=None means unbounded, 0 disables caching.
+        self._extract_cached = lru_cache(maxsize=cache_size)(self._extract_grades_text)
+        self._subject_cached = lru_cache(maxsize=cache_size)(self._standardize_subject_text)
+        self._grade_cached = lru_cache(maxsize=cache_size)(self._standardize_grade_text)
+    
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters and sizes of the parsing caches"""
+        stats = {}
+        for name, cached in (('extract_grades', self._extract_cached),
+                             ('standardize_subject', self._subject_cached),
+                             ('standardize_grade', self._grade_cached)):
+            info = cached.cache_info()
+            stats[name] = {'hits': info.hits, 'misses': info.misses,
+                           'size': info.currsize, 'max_size': info.maxsize}
+        return stats
+    
+    def clear_caches(self):
+        """Empty the parsing caches and reset their counters"""
+        self._extract_cached.cache_clear()
+        self._subject_cached.cache_clear()
+        self._grade_cached.cache_clear()
     
     def extract_grades_robust(self, text: str) -> List[Tuple[str, str]]:
         """Robust grade extraction handling all formats"""
-        if not text or pd.isna(text) or str(text).strip().lower() in ['nan', 'n/a', '-', 'na', '']:
+        if not text or pd.isna(text) or str(text).strip().lower() in _BLANK_ANSWERS:
             return []
         
-        text = str(text).strip()
+        return list(self._extract_cached(str(text).strip().replace('\r\n', '\n')))
+    
+    def _extract_grades_text(self, text: str) -> Tuple[Tuple[str, str], ...]:
+        """Uncached extraction from stripped, newline-normalised text"""
         pairs = []
         
         # Handle special single-grade cases first
-        if re.match(r'^[A-Z*]{1,3}$', text.upper()):  # Like "AAA", "BBB", "A*"
-            return [("Combined Subjects", text.upper())]
+        if _SINGLE_GRADE_RE.match(text.upper()):  # Like "AAA", "BBB", "A*"
+            return (("Combined Subjects", text.upper()),)
         
-        if re.match(r'^\d$', text):  # Single number like "8"
-            return [("General Target", text)]
+        if _SINGLE_DIGIT_RE.match(text):  # Single number like "8"
+            return (("General Target", text),)
         
         if text.lower() in ['merit', 'distinction', 'pass']:
-            return [("General Grade", text.title())]
+            return (("General Grade", text.title()),)
         
         # Split by newlines first, then by commas
         lines = []
@@ -114,7 +197,7 @@ class ImprovedGradeStandardizer:
         
         for line in lines:
             # Further split by commas if present
-            if ',' in line and not re.search(r'[A-Za-z]+\s*,\s*[A-Za-z]+\s*-', line):
+            if ',' in line and not _COMMA_PAIR_RE.search(line):
                 parts = [part.strip() for part in line.split(',') if part.strip()]
             else:
                 parts = [line]
@@ -123,76 +206,68 @@ class ImprovedGradeStandardizer:
                 part_pairs = self._extract_from_part(part)
                 pairs.extend(part_pairs)
         
-        return pairs
+        return tuple(pairs)
     
     def _extract_from_part(self, part: str) -> List[Tuple[str, str]]:
-        """Extract subject-grade pairs from a single part"""
+        """Extract subject-grade pairs from a single part in one pass over its separators"""
         pairs = []
         part = part.strip()
         
         if not part:
             return pairs
         
-        # Pattern 1: Subject - Grade (most common)
-        pattern1 = r'([A-Za-z\s&\']+?)\s*[-–]\s*([A-Z*\d]+|Merit|Distinction|Pass|N/?A|NA|DMM|DDD|MMM|L2|Foundation)'
-        matches = list(re.finditer(pattern1, part, re.IGNORECASE))
-        
-        if matches:
-            for match in matches:
-                subject = match.group(1).strip()
-                grade = match.group(2).strip()
-                if len(subject) > 1:  # Avoid single letters
-                    pairs.append((subject, grade))
-            return pairs
-        
-        # Pattern 2: Subject: Grade
-        pattern2 = r'([A-Za-z\s&\']+?)\s*:\s*([A-Z*\d]+|Merit|Distinction|Pass|N/?A|NA|DMM|DDD|MMM|L2)'
-        matches = list(re.finditer(pattern2, part, re.IGNORECASE))
-        
-        if matches:
-            for match in matches:
-                subject = match.group(1).strip()
-                grade = match.group(2).strip()
-                if len(subject) > 1:
-                    pairs.append((subject, grade))
-            return pairs
-        
-        # Pattern 3: Subject (Grade) format
-        pattern3 = r'([A-Za-z\s&\']+?)\s*\(([A-Z*\d]+|Merit|Distinction|Pass)\)'
-        matches = list(re.finditer(pattern3, part, re.IGNORECASE))
-        
-        if matches:
-            for match in matches:
-                subject = match.group(1).strip()
-                grade = match.group(2).strip()
-                if len(subject) > 1:
-                    pairs.append((subject, grade))
-            return pairs
-        
-        # Pattern 4: Try to find subjects and grades separately
-        # Look for known subjects
-        found_subject = None
-        for subject_key in self.subject_mappings.keys():
-            if subject_key in part.lower():
-                found_subject = subject_key
-                break
-        
-        if found_subject:
+        # Pairs found after each kind of separator, in priority order:
+        # "Subject - Grade", then "Subject: Grade", then "Subject (Grade)"
+        found = ([], [], [])
+        resume_at = [0, 0, 0]
+        
+        for match in _SEPARATOR_RE.finditer(part):
+            separator, grade, _, paren_grade = match.groups()
+            if separator:
+                if not grade:
+                    continue
+                kind = 1 if separator == ':' else 0
+                grade_end = match.end('grade')
+            else:
+                if not paren_grade:
+                    continue
+                kind = 2
+                grade = paren_grade
+                grade_end = match.end('paren_grade') + 1
+            
+            # The subject is the text run before the separator, minus anything already matched
+            subject_start = max(match.start(), resume_at[kind])
+            subject_end = match.end() - 1
+            if subject_start < subject_end:
+                found[kind].append((part[subject_start:subject_end].strip(), grade))
+                resume_at[kind] = grade_end
+        
+        for kind_pairs in found:
+            if kind_pairs:
+                # Avoid single letters
+                return [(subject, grade) for subject, grade in kind_pairs if len(subject) > 1]
+        
+        # Fallback: look for a known subject as a whole word, preferring the longest
+        lowered = part.lower()
+        keyword_match = self.subject_matcher.longest_match(lowered)
+        
+        if keyword_match:
+            start, end, found_subject = keyword_match
             # Look for grade in the remaining text
-            remaining = part.lower().replace(found_subject, '').strip()
-            grade_match = re.search(r'([A-Z*\d]+|Merit|Distinction|Pass|N/?A|NA)', remaining, re.IGNORECASE)
+            remaining = (lowered[:start] + lowered[end:]).strip()
+            grade_match = _GRADE_SEARCH_RE.search(remaining)
             if grade_match:
                 pairs.append((found_subject, grade_match.group(1)))
             else:
                 pairs.append((found_subject, "N/A"))
         
-        # Pattern 5: If it contains grade-like patterns, treat as subject
-        elif re.search(r'[A-Z*\d]+|Merit|Distinction|Pass', part, re.IGNORECASE):
-            grade_match = re.search(r'([A-Z*\d]+|Merit|Distinction|Pass)', part, re.IGNORECASE)
+        # Otherwise treat the first grade-like run as the grade and the rest as subject
+        else:
+            grade_match = _GRADE_RUN_RE.search(part)
             if grade_match:
-                subject_part = part.replace(grade_match.group(1), '').strip(' -:')
+                subject_part = part.replace(grade_match.group(), '').strip(' -:')
                 if subject_part:
-                    pairs.append((subject_part, grade_match.group(1)))
+                    pairs.append((subject_part, grade_match.group()))
         
         return pairs
     
@@ -201,34 +276,78 @@ class ImprovedGradeStandardizer:
         if not subject:
             return "Unknown Subject"
         
-        subject = subject.strip().lower()
-        
-        # Remove common prefixes/suffixes
-        subject = re.sub(r'^(btec|level \d+|l\d+)\s*', '', subject)
-        subject = re.sub(r'\s*(gcse|a-level|as)$', '', subject)
-        subject = re.sub(r'\s*\([^)]*\)$', '', subject)
-        subject = re.sub(r'[^\w\s&]', '', subject)  # Remove special chars except &
-        subject = re.sub(r'\s+', ' ', subject).strip()
-        
+        return self._subject_cached(subject.strip().lower())
+    
+    def _standardize_subject_text(self, subject: str) -> str:
+        """Uncached standardization of a stripped, lowercased subject"""
+        # Known aliases, including their common prefixed/suffixed spellings
+        standardized = self.SUBJECT_ALIAS_INDEX.get(subject)
+        if standardized is not None:
+            return standardized
+        
+        return self._resolve_subject(self._normalize_subject(subject))
+    
+    @staticmethod
+    def _normalize_subject(subject: str) -> str:
+        """Strip qualification prefixes/suffixes and punctuation from a lowercased subject"""
+        subject = _SUBJECT_PREFIX_RE.sub('', subject)
+        subject = _SUBJECT_SUFFIX_RE.sub('', subject)
+        subject = _SUBJECT_BRACKETS_RE.sub('', subject)
+        subject = _SUBJECT_SPECIAL_RE.sub('', subject)  # Remove special chars except &
+        return _WHITESPACE_RE.sub(' ', subject).strip()
+    
+    @classmethod
+    def _resolve_subject(cls, subject: str) -> str:
+        """Map a normalised subject to its standard name"""
         # Direct mapping
-        if subject in self.subject_mappings:
-            return self.subject_mappings[subject]
+        if subject in cls.SUBJECT_MAPPINGS:
+            return cls.SUBJECT_MAPPINGS[subject]
+        
+        # Ranked fallback: the longest alias contained as whole words wins...
+        keyword_match = cls.SUBJECT_MATCHER.longest_match(subject)
+        if keyword_match:
+            return cls.SUBJECT_MAPPINGS[keyword_match[2]]
         
-        # Fuzzy matching
-        for key, value in self.subject_mappings.items():
-            if key in subject or subject in key:
-                return value
+        # ...then the shortest alias with a word starting with the subject ("chem", "social care")
+        alias = cls.SUBJECT_PREFIX_INDEX.get(subject)
+        if alias is not None:
+            return cls.SUBJECT_MAPPINGS[alias]
         
         # Title case if no match
         return subject.title() if subject else "Unknown Subject"
     
+    @classmethod
+    def _build_subject_indexes(cls):
+        """Precompute the keyword automaton and alias lookups from SUBJECT_MAPPINGS"""
+        cls.SUBJECT_MATCHER = SubjectKeywordMatcher(cls.SUBJECT_MAPPINGS.keys())
+        
+        # Partial names: every word-aligned prefix of every alias, ranked shortest alias first
+        prefix_index = {}
+        for alias in sorted(cls.SUBJECT_MAPPINGS, key=lambda key: (len(key), key)):
+            for word_start in [0] + [i + 1 for i, char in enumerate(alias) if char == ' ']:
+                tail = alias[word_start:]
+                for end in range(_MIN_PREFIX_LENGTH, len(tail) + 1):
+                    prefix_index.setdefault(tail[:end].strip(), alias)
+        cls.SUBJECT_PREFIX_INDEX = prefix_index
+        
+        # Raw spellings, resolved through the same path an uncached lookup takes
+        alias_index = {}
+        for alias in cls.SUBJECT_MAPPINGS:
+            for prefix in _ALIAS_PREFIXES:
+                for suffix in _ALIAS_SUFFIXES:
+                    variant = f"{prefix}{alias}{suffix}"
+                    alias_index[variant] = cls._resolve_subject(cls._normalize_subject(variant))
+        cls.SUBJECT_ALIAS_INDEX = alias_index
+    
     def standardize_grade(self, grade: str) -> str:
         """Standardize grade"""
         if not grade or pd.isna(grade):
             return "N/A"
         
-        grade = str(grade).strip()
-        
+        return self._grade_cached(str(grade).strip())
+    
+    def _standardize_grade_text(self, grade: str) -> str:
+        """Uncached standardization of a stripped grade"""
         # Handle N/A cases
         if grade.lower() in ['na', 'n/a', '-', 'nan', 'no grade', 'not available']:
             return "N/A"
@@ -261,49 +380,225 @@ class ImprovedGradeStandardizer:
         
         return grade.upper()
     
-    def process_all_data(self, df: pd.DataFrame) -> List[Dict]:
-        """Process all student data"""
+    def process_all_data(self, rows: Union[pd.DataFrame, Iterable[Tuple]],
+                         state_path: Optional[str] = None, store_path: Optional[str] = None) -> List[Dict]:
+        """Process all student data from a DataFrame or a stream of tracker rows"""
+        standardized_data = self._process_rows(rows, state_path)
+        
+        # The SQLite store is optional and rebuilt from this run's results
+        if store_path:
+            from grade_store import save_grade_store
+            save_grade_store(standardized_data, store_path)
+        
+        return standardized_data
+    
+    def _process_rows(self, rows: Union[pd.DataFrame, Iterable[Tuple]], state_path: Optional[str]) -> List[Dict]:
+        """Standardize every row, incrementally when a state file is given"""
+        # With a state file, only new or changed rows are standardized
+        if state_path:
+            return self._process_incremental(rows, state_path)
+        
+        if isinstance(rows, pd.DataFrame):
+            print(f"Processing {len(rows)} rows...")
+            return self._process_frame(rows)
+        
         standardized_data = []
+        row_count = 0
+        for row in as_tracker_rows(rows):
+            row_count += 1
+            student = self.process_row(row)
+            if student is not None:
+                standardized_data.append(student)
+        
+        print(f"Processed {row_count} streamed rows...")
+        
+        return standardized_data
+    
+    def extract_grades_columnar(self, current: pd.Series, predicted: pd.Series) -> pd.DataFrame:
+        """Extract standardized pairs from whole answer columns as a (row, subject, grade, kind) frame"""
+        # Rows are keyed by position: index labels need not be unique (e.g. concatenated exports)
+        frames = [self._extract_column(current.reset_index(drop=True), 'current'),
+                  self._extract_column(predicted.reset_index(drop=True), 'predicted')]
+        pairs = pd.concat(frames, ignore_index=True)
+        
+        # Same order process_row applies pairs in: current before predicted, then answer order
+        pairs['kind_order'] = (pairs['kind'] == 'predicted').astype(int)
+        pairs = pairs.sort_values(['row', 'kind_order', 'position'], kind='stable')
+        return pairs[['row', 'subject', 'grade', 'kind']].reset_index(drop=True)
+    
+    def _extract_column(self, column: pd.Series, kind: str) -> pd.DataFrame:
+        """Vectorized extraction for one answer column, with a per-cell fallback"""
+        text = column.astype('string').str.strip().str.replace('\r\n', '\n', regex=False)
+        text = text[text.notna() & ~text.str.lower().isin(_BLANK_ANSWERS)]
+        
+        # Whole-answer special cases ("AAA", "8", "Merit") go through the per-cell path
+        special = (text.str.upper().str.fullmatch(r'[A-Z*]{1,3}')
+                   | text.str.fullmatch(r'\d')
+                   | text.str.lower().isin(['merit', 'distinction', 'pass']))
+        candidates = text[~special]
+        
+        lines = candidates.str.split('\n').explode().str.strip()
+        lines = lines[lines.notna() & (lines != '')]
+        simple = lines.str.fullmatch(_SIMPLE_LINE_PATTERN, flags=re.IGNORECASE) & ~lines.str.contains(',', regex=False)
+        simple_cells = simple.groupby(level=0).all()
+        simple_cells = simple_cells[simple_cells].index
+        
+        # Simple cells: one "Subject - Grade" per line, handled across the column at once
+        lines = lines[lines.index.isin(simple_cells)]
+        extracted = lines.str.extract(_SIMPLE_LINE_PATTERN, flags=re.IGNORECASE)
+        vectorized = pd.DataFrame({
+            'row': lines.index,
+            'subject': extracted[0].str.strip().to_numpy(),
+            'grade': extracted[1].to_numpy(),
+            'position': lines.groupby(level=0).cumcount().to_numpy()
+        })
+        vectorized = vectorized[vectorized['subject'].str.len() > 1]
+        
+        # Everything else: the per-row parser, one cell at a time
+        fallback = []
+        for row, value in text[~text.index.isin(simple_cells)].items():
+            for position, (subject, grade) in enumerate(self.extract_grades_robust(value)):
+                fallback.append((row, subject, grade, position))
+        fallback = pd.DataFrame(fallback, columns=['row', 'subject', 'grade', 'position'])
+        
+        pairs = pd.concat([vectorized, fallback], ignore_index=True)
+        
+        # Standardize each distinct spelling once
+        subjects = {subject: self.standardize_subject(subject) for subject in pd.unique(pairs['subject'])}
+        grades = {grade: self.standardize_grade(grade) for grade in pd.unique(pairs['grade'])}
+        pairs['subject'] = pairs['subject'].map(subjects)
+        pairs['grade'] = pairs['grade'].map(grades)
+        pairs['kind'] = kind
+        return pairs
+    
+    def _process_frame(self, df: pd.DataFrame) -> List[Dict]:
+        """Standardize a whole DataFrame using the column-wide extraction path"""
+        pairs = self.extract_grades_columnar(df[CURRENT_COLUMN], df[PREDICTED_COLUMN])
         
-        print(f"Processing {len(df)} rows...")
+        pairs_by_row = {}
+        for row, subject, grade, kind in pairs.itertuples(index=False, name=None):
+            pairs_by_row.setdefault(row, []).append((subject, grade, kind))
         
-        for index, row in df.iterrows():
-            name = row['Full Name']
-            if pd.isna(name) or not str(name).strip():
+        standardized_data = []
+        for row, values in enumerate(rows_from_dataframe(df)):
+            student = self._new_student(values)
+            if student is None:
                 continue
+            for subject, grade, kind in pairs_by_row.get(row, []):
+                if subject not in student['subjects']:
+                    student['subjects'][subject] = {'current': 'N/A', 'predicted': 'N/A'}
+                student['subjects'][subject][kind] = grade
+            standardized_data.append(student)
+        
+        return standardized_data
+    
+    def iter_students(self, rows: Union[pd.DataFrame, Iterable[Tuple]]) -> Iterator[Dict]:
+        """Lazily standardize tracker rows, skipping blank responses"""
+        for row in as_tracker_rows(rows):
+            student = self.process_row(row)
+            if student is not None:
+                yield student
+    
+    def process_row(self, row: Tuple) -> Dict:
+        """Standardize a single tracker row, or return None for blank responses"""
+        student = self._new_student(row)
+        if student is None:
+            return None
+        
+        # Process current grades
+        current_pairs = self.extract_grades_robust(student['raw_current'])
+        for subject, grade in current_pairs:
+            std_subject = self.standardize_subject(subject)
+            std_grade = self.standardize_grade(grade)
             
-            student = {
-                'name': str(name).strip(),
-                'school': str(row['School You Attend']).strip() if not pd.isna(row['School You Attend']) else "Unknown",
-                'year': str(row['What year are you in']).strip() if not pd.isna(row['What year are you in']) else "Unknown",
-                'subjects': {},
-                'raw_current': str(row['Please list all the subjects you are currently taking and your current grades']) if not pd.isna(row['Please list all the subjects you are currently taking and your current grades']) else "",
-                'raw_predicted': str(row['Please list all your predicted grades for each subject']) if not pd.isna(row['Please list all your predicted grades for each subject']) else ""
-            }
-            
-            # Process current grades
-            current_pairs = self.extract_grades_robust(student['raw_current'])
-            for subject, grade in current_pairs:
-                std_subject = self.standardize_subject(subject)
-                std_grade = self.standardize_grade(grade)
-                
-                if std_subject not in student['subjects']:
-                    student['subjects'][std_subject] = {'current': 'N/A', 'predicted': 'N/A'}
-                student['subjects'][std_subject]['current'] = std_grade
+            if std_subject not in student['subjects']:
+                student['subjects'][std_subject] = {'current': 'N/A', 'predicted': 'N/A'}
+            student['subjects'][std_subject]['current'] = std_grade
+        
+        # Process predicted grades
+        predicted_pairs = self.extract_grades_robust(student['raw_predicted'])
+        for subject, grade in predicted_pairs:
+            std_subject = self.standardize_subject(subject)
+            std_grade = self.standardize_grade(grade)
             
-            # Process predicted grades
-            predicted_pairs = self.extract_grades_robust(student['raw_predicted'])
-            for subject, grade in predicted_pairs:
-                std_subject = self.standardize_subject(subject)
-                std_grade = self.standardize_grade(grade)
-                
-                if std_subject not in student['subjects']:
-                    student['subjects'][std_subject] = {'current': 'N/A', 'predicted': 'N/A'}
-                student['subjects'][std_subject]['predicted'] = std_grade
+            if std_subject not in student['subjects']:
+                student['subjects'][std_subject] = {'current': 'N/A', 'predicted': 'N/A'}
+            student['subjects'][std_subject]['predicted'] = std_grade
+        
+        return student
+    
+    def _new_student(self, row: Tuple) -> Optional[Dict]:
+        """Student record with no subjects yet, or None for blank responses"""
+        name, school, year, raw_current, raw_predicted = row
+        if pd.isna(name) or not str(name).strip():
+            return None
+        
+        return {
+            'name': str(name).strip(),
+            'school': str(school).strip() if not pd.isna(school) else "Unknown",
+            'year': str(year).strip() if not pd.isna(year) else "Unknown",
+            'subjects': {},
+            'raw_current': str(raw_current) if not pd.isna(raw_current) else "",
+            'raw_predicted': str(raw_predicted) if not pd.isna(raw_predicted) else ""
+        }
+    
+    def _process_incremental(self, rows: Union[pd.DataFrame, Iterable[Tuple]], state_path: str) -> List[Dict]:
+        """Standardize new or changed rows and reuse stored results for the rest"""
+        previous = self._load_state(state_path)
+        
+        standardized_data = []
+        state_rows = []
+        reused = 0
+        
+        for index, row in enumerate(as_tracker_rows(rows)):
+            fingerprint = self._row_fingerprint(row)
+            if index < len(previous) and previous[index]['fingerprint'] == fingerprint:
+                student = previous[index]['student']
+                reused += 1
+            else:
+                student = self.process_row(row)
             
-            standardized_data.append(student)
+            state_rows.append({'fingerprint': fingerprint, 'student': student})
+            if student is not None:
+                standardized_data.append(student)
+        
+        self._save_state(state_path, state_rows)
+        print(f"Processed {len(state_rows)} rows: {reused} unchanged, {len(state_rows) - reused} new or changed")
         
         return standardized_data
+    
+    def _row_fingerprint(self, row: Tuple) -> str:
+        """Stable hash of a row's raw cell values"""
+        cells = [None if pd.isna(value) else str(value) for value in row]
+        return hashlib.sha1(json.dumps(cells, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
+    def _load_state(self, state_path: str) -> List[Dict]:
+        """Load stored row results, or nothing if missing or from another version"""
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return []
+        
+        if state.get('version') != self.STANDARDIZER_VERSION:
+            return []
+        return state.get('rows', [])[:state.get('watermark', 0)]
+    
+    def _save_state(self, state_path: str, state_rows: List[Dict]):
+        """Persist the watermark and per-row results atomically"""
+        state = {
+            'version': self.STANDARDIZER_VERSION,
+            'watermark': len(state_rows),
+            'rows': state_rows
+        }
+        with atomic_write(state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+
+ImprovedGradeStandardizer._build_subject_indexes()
+
+def records_source_tag(path: str = TRACKER_FILE, sheet_name: str = TRACKER_SHEET) -> str:
+    """Workbook content, sheet and standardizer version that saved records were built from"""
+    return f"{ImprovedGradeStandardizer.STANDARDIZER_VERSION}:{workbook_digest(path)}:{sheet_name}"
 
 def main():
     """Main standardization function"""
@@ -311,15 +606,15 @@ def main():
         print("🔧 IMPROVED GRADE DATA STANDARDIZATION")
         print("=" * 60)
         
-        # Load data
-        df = pd.read_excel('KOC Grade Tracker Form(1-52).xlsx', sheet_name='Sheet1')
-        print(f"Loaded {len(df)} rows from Excel file")
+        # Load rows (from the ingestion cache when the workbook is unchanged)
+        rows = load_tracker_rows(TRACKER_FILE, TRACKER_SHEET)
+        print(f"Loaded {len(rows)} rows from {TRACKER_FILE}")
         
         # Initialize standardizer
         standardizer = ImprovedGradeStandardizer()
         
         # Process all data
-        standardized_data = standardizer.process_all_data(df)
+        standardized_data = standardizer.process_all_data(rows, state_path=STATE_FILE)
         
         # Save to JSON
         with open('standardized_grades.json', 'w', encoding='utf-8') as f:
@@ -328,6 +623,17 @@ def main():
         print(f"\n✅ Processed {len(standardized_data)} students")
         print("✅ Saved to: standardized_grades.json")
         
+        # Compact binary copy that the report scripts load instead of re-standardizing
+        save_records(standardized_data, RECORDS_FILE, records_source_tag(TRACKER_FILE, TRACKER_SHEET))
+        print(f"✅ Saved to: {RECORDS_FILE}")
+        
+        # Columnar copy for analysis; pyarrow is optional
+        try:
+            write_grade_dataset(standardized_data, DATASET_DIR)
+            print(f"✅ Saved columnar dataset to: {DATASET_DIR}/ (partitioned by year)")
+        except ImportError as e:
+            print(f"ℹ️ Skipped columnar dataset: {e}")
+        
         # Show summary
         total_subjects = set()
         students_with_data = 0
@@ -346,6 +652,10 @@ def main():
         print(f"\n📈 SUMMARY:")
         print(f"   Students with grade data: {students_with_data}")
         print(f"   Unique subjects found: {len(total_subjects)}")
+        for name, stats in standardizer.cache_stats().items():
+            lookups = stats['hits'] + stats['misses']
+            if lookups:
+                print(f"   {name} cache: {stats['hits']}/{lookups} hits ({stats['hits'] / lookups:.0%})")
         
         return standardized_data
         
@@ -0,0 +1,62 @@
+import gzip
+import hashlib
+import os
+from atomic_files import atomic_write
+from typing import Iterable, List
+from report_templates import SHAREABLE_STYLESHEET, SHARED_STYLESHEET
+
+# Artifacts worth serving precompressed
+ASSET_EXTENSIONS = ('.html', '.css', '.js', '.json')
+
+def write_shared_stylesheet(output_dir: str, stylesheet: str = SHARED_STYLESHEET, name: str = 'report') -> str:
+    """Write <name>.<hash>.css once per content and return its path"""
+    data = stylesheet.encode('utf-8')
+    path = os.path.join(output_dir, f"{name}.{hashlib.sha256(data).hexdigest()[:12]}.css")
+    
+    # The name changes with the content, so an existing file is already right
+    if not os.path.exists(path):
+        os.makedirs(output_dir or '.', exist_ok=True)
+        with atomic_write(path) as f:
+            f.write(data)
+    return path
+
+def write_shareable_stylesheet(output_dir: str) -> str:
+    """Write the shareable report's own shareable.<hash>.css and return its path"""
+    return write_shared_stylesheet(output_dir, SHAREABLE_STYLESHEET, 'shareable')
+
+def stylesheet_href(stylesheet_path: str, page_dir: str) -> str:
+    """Link to the stylesheet from a page written in page_dir"""
+    return os.path.relpath(stylesheet_path, page_dir or '.').replace(os.sep, '/')
+
+def precompress(paths: Iterable[str], brotli: bool = False) -> List[str]:
+    """Write .gz (and, if the brotli module is installed, .br) copies next to each file"""
+    brotli_module = None
+    if brotli:
+        try:
+            import brotli as brotli_module
+        except ImportError:
+            print("Warning: brotli is not installed; writing .gz files only")
+    
+    written = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        # mtime=0 keeps the .gz bytes stable across runs for unchanged content
+        variants = [(f"{path}.gz", gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli_module is not None:
+            variants.append((f"{path}.br", brotli_module.compress(data)))
+        
+        for variant_path, compressed in variants:
+            with open(variant_path, 'wb') as f:
+                f.write(compressed)
+            written.append(variant_path)
+    
+    return written
+
+def precompress_tree(directory: str, brotli: bool = False) -> List[str]:
+    """Precompress every HTML/CSS/JS/JSON file under directory"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(ASSET_EXTENSIONS))
+    return precompress(sorted(paths), brotli)
\ No newline at end of file
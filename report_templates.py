@@ -0,0 +1,898 @@
+import string
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Anything with a write(str) signature: file.write, StringIO.write, list.append
+Writer = Callable[[str], object]
+
+# Stylesheets are plain CSS; they are inserted as values, so braces need no escaping
+FINAL_STYLESHEET = """        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background-color: white;
+            padding: 30px;
+            border-radius: 15px;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 40px;
+            border-bottom: 3px solid #2c3e50;
+            padding-bottom: 20px;
+        }
+        .header h1 {
+            color: #2c3e50;
+            margin: 0;
+            font-size: 2.8em;
+            font-weight: 700;
+        }
+        .header p {
+            color: #7f8c8d;
+            margin: 15px 0 0 0;
+            font-size: 1.2em;
+        }
+        .summary-stats {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 25px;
+            margin-bottom: 40px;
+        }
+        .stat-card {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 25px;
+            border-radius: 15px;
+            text-align: center;
+            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+            transition: transform 0.3s ease;
+        }
+        .stat-card:hover {
+            transform: translateY(-5px);
+        }
+        .stat-number {
+            font-size: 3em;
+            font-weight: bold;
+            margin-bottom: 10px;
+        }
+        .stat-label {
+            font-size: 1em;
+            opacity: 0.9;
+        }
+        .section {
+            margin-bottom: 50px;
+        }
+        .section h2 {
+            color: #2c3e50;
+            border-left: 6px solid #3498db;
+            padding-left: 20px;
+            margin-bottom: 25px;
+            font-size: 1.8em;
+        }
+        .student-card {
+            background-color: #f8f9fa;
+            border: 1px solid #dee2e6;
+            border-radius: 12px;
+            padding: 25px;
+            margin-bottom: 25px;
+            transition: box-shadow 0.3s ease;
+        }
+        .student-card:hover {
+            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+        }
+        .student-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 20px;
+            flex-wrap: wrap;
+        }
+        .student-name {
+            font-size: 1.4em;
+            font-weight: bold;
+            color: #2c3e50;
+        }
+        .student-info {
+            color: #6c757d;
+            font-size: 1em;
+        }
+        .grades-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 15px;
+            border-radius: 8px;
+            overflow: hidden;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+        }
+        .grades-table th, .grades-table td {
+            padding: 12px 15px;
+            text-align: left;
+            border-bottom: 1px solid #dee2e6;
+        }
+        .grades-table th {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            font-weight: 600;
+        }
+        .grades-table tr:nth-child(even) {
+            background-color: #f8f9fa;
+        }
+        .grades-table tr:hover {
+            background-color: #e9ecef;
+        }
+        .status-exceeding { color: #28a745; font-weight: bold; }
+        .status-meeting { color: #28a745; }
+        .status-below { color: #dc3545; font-weight: bold; }
+        .status-gray { color: #6c757d; }
+        .status-blue { color: #007bff; }
+        .status-green { color: #28a745; }
+        .status-yellow { color: #ffc107; }
+        .status-darkgreen { color: #155724; font-weight: bold; }
+        .status-red { color: #dc3545; font-weight: bold; }
+        
+        .performance-summary {
+            background: linear-gradient(135deg, #e3f2fd 0%, #bbdefb 100%);
+            border-left: 5px solid #2196f3;
+            padding: 20px;
+            margin-top: 20px;
+            border-radius: 0 10px 10px 0;
+        }
+        .alert-attention {
+            background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%);
+            border: 1px solid #ffeaa7;
+            border-radius: 10px;
+            padding: 20px;
+            margin-bottom: 25px;
+        }
+        .alert-success {
+            background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
+            border: 1px solid #c3e6cb;
+            border-radius: 10px;
+            padding: 20px;
+            margin-bottom: 25px;
+        }
+        .priority-high { border-left: 6px solid #dc3545; }
+        .priority-medium { border-left: 6px solid #ffc107; }
+        .priority-low { border-left: 6px solid #28a745; }
+        
+        .recommendations {
+            background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
+            padding: 30px;
+            border-radius: 15px;
+            border: 1px solid #dee2e6;
+        }
+        .recommendations ol {
+            line-height: 2;
+            font-size: 1.1em;
+        }
+        .recommendations li {
+            margin-bottom: 10px;
+        }
+        
+        @media (max-width: 768px) {
+            .container { padding: 15px; }
+            .student-header { flex-direction: column; align-items: flex-start; }
+            .grades-table { font-size: 0.9em; }
+            .stat-card { padding: 20px; }
+            .header h1 { font-size: 2.2em; }
+        }
+"""
+
+SHAREABLE_STYLESHEET = """        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background-color: white;
+            padding: 30px;
+            border-radius: 10px;
+            box-shadow: 0 0 20px rgba(0,0,0,0.1);
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 30px;
+            border-bottom: 3px solid #2c3e50;
+            padding-bottom: 20px;
+        }
+        .header h1 {
+            color: #2c3e50;
+            margin: 0;
+            font-size: 2.5em;
+        }
+        .header p {
+            color: #7f8c8d;
+            margin: 10px 0 0 0;
+            font-size: 1.1em;
+        }
+        .summary-stats {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+        .stat-card {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px;
+            border-radius: 10px;
+            text-align: center;
+        }
+        .stat-number {
+            font-size: 2.5em;
+            font-weight: bold;
+            margin-bottom: 5px;
+        }
+        .stat-label {
+            font-size: 0.9em;
+            opacity: 0.9;
+        }
+        .section {
+            margin-bottom: 40px;
+        }
+        .section h2 {
+            color: #2c3e50;
+            border-left: 5px solid #3498db;
+            padding-left: 15px;
+            margin-bottom: 20px;
+        }
+        .student-card {
+            background-color: #f8f9fa;
+            border: 1px solid #dee2e6;
+            border-radius: 8px;
+            padding: 20px;
+            margin-bottom: 20px;
+        }
+        .student-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 15px;
+            flex-wrap: wrap;
+        }
+        .student-name {
+            font-size: 1.3em;
+            font-weight: bold;
+            color: #2c3e50;
+        }
+        .student-info {
+            color: #6c757d;
+            font-size: 0.9em;
+        }
+        .grades-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 10px;
+        }
+        .grades-table th, .grades-table td {
+            padding: 8px 12px;
+            text-align: left;
+            border-bottom: 1px solid #dee2e6;
+        }
+        .grades-table th {
+            background-color: #e9ecef;
+            font-weight: 600;
+            color: #495057;
+        }
+        .status-exceeding { color: #28a745; font-weight: bold; }
+        .status-meeting { color: #28a745; }
+        .status-below { color: #dc3545; font-weight: bold; }
+        .status-nodata { color: #6c757d; }
+        .status-target { color: #007bff; }
+        .status-current { color: #17a2b8; }
+        .performance-summary {
+            background-color: #e7f3ff;
+            border-left: 4px solid #007bff;
+            padding: 15px;
+            margin-top: 15px;
+            border-radius: 0 5px 5px 0;
+        }
+        .alert-attention {
+            background-color: #fff3cd;
+            border: 1px solid #ffeaa7;
+            border-radius: 5px;
+            padding: 15px;
+            margin-bottom: 20px;
+        }
+        .alert-success {
+            background-color: #d4edda;
+            border: 1px solid #c3e6cb;
+            border-radius: 5px;
+            padding: 15px;
+            margin-bottom: 20px;
+        }
+        .priority-high { border-left: 5px solid #dc3545; }
+        .priority-medium { border-left: 5px solid #ffc107; }
+        .priority-low { border-left: 5px solid #28a745; }
+        @media (max-width: 768px) {
+            .student-header {
+                flex-direction: column;
+                align-items: flex-start;
+            }
+            .grades-table {
+                font-size: 0.9em;
+            }
+        }
+"""
+
+# Extra rules for the paginated pages of the sharded report
+PAGINATION_STYLESHEET = """        .pagination {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 8px;
+            margin: 20px 0;
+        }
+        .pagination a, .pagination span {
+            padding: 6px 12px;
+            border-radius: 6px;
+            border: 1px solid #dee2e6;
+            text-decoration: none;
+            color: #2c3e50;
+        }
+        .pagination .current {
+            background-color: #2c3e50;
+            color: white;
+        }
+"""
+
+# Extra rules for the client-rendered (virtualized) report
+VIRTUAL_STYLESHEET = """        .report-controls {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 12px;
+            align-items: center;
+            margin-bottom: 20px;
+        }
+        .report-controls input, .report-controls select {
+            padding: 8px 12px;
+            border: 1px solid #dee2e6;
+            border-radius: 6px;
+            font-size: 1em;
+        }
+        .report-controls input {
+            flex: 1 1 220px;
+        }
+        .visible-count {
+            color: #6c757d;
+        }
+        .student-spacer {
+            position: relative;
+        }
+        .virtual-card {
+            position: absolute;
+            left: 0;
+            right: 0;
+            margin: 0;
+            box-sizing: border-box;
+            overflow: hidden;
+        }
+        .virtual-card .student-header {
+            height: 34px;
+            flex-wrap: nowrap;
+            overflow: hidden;
+        }
+        .virtual-card .grades-table th, .virtual-card .grades-table td {
+            height: 20px;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+"""
+
+# Extra rules for the search box backed by the static search index
+SEARCH_STYLESHEET = """        .report-search input {
+            width: 100%;
+            box-sizing: border-box;
+            padding: 10px 14px;
+            border: 1px solid #dee2e6;
+            border-radius: 8px;
+            font-size: 1.05em;
+        }
+        .search-summary {
+            color: #6c757d;
+            margin: 10px 0;
+        }
+"""
+
+# Templates use $name fields (string.Template syntax)
+TEMPLATES = {
+    'page_head': """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Colleges Grade Analysis Report</title>
+    <meta charset="UTF-8">
+$meta$styles</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🎓 Colleges Grade Analysis Report</h1>
+$header        </div>
+""",
+    'inline_style': """    <style>
+$stylesheet    </style>
+""",
+    'stylesheet_link': """    <link rel="stylesheet" href="$href">
+""",
+    'summary_stats': """
+        <div class="summary-stats">
+$cards        </div>
+""",
+    'stat_card': """            <div class="stat-card">
+                <div class="stat-number">$value</div>
+                <div class="stat-label">$label</div>
+            </div>
+""",
+    'section_open': """
+        <div class="section">
+            <h2>$heading</h2>
+""",
+    'section_close': """        </div>
+""",
+    'alert': """            <div class="$alert_class">
+                <strong>$lead</strong> $message
+            </div>
+""",
+    'student_card_open': """
+            <div class="student-card $priority_class">
+                <div class="student-header">
+                    <div class="student-name">$icon $name</div>
+                    <div class="student-info">🏫 $school | 📅 $year</div>
+                </div>
+$summary                <table class="grades-table">
+                    <thead>
+                        <tr>
+                            <th>Subject</th>
+                            <th>Current Grade</th>
+                            <th>Target Grade</th>
+                            <th>Status</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""",
+    'performance_summary': """                <div class="performance-summary">
+                    <strong>Performance Summary:</strong> 
+                    🎉 Exceeding: $exceeding | 
+                    ✅ Meeting: $meeting | 
+                    ⚠️ Below: $below
+                </div>
+""",
+    'grade_row': """                        <tr>
+                            <td>$subject</td>
+                            <td>$current</td>
+                            <td>$predicted</td>
+                            <td class="$status_class">$icon $status</td>
+                        </tr>
+""",
+    'student_card_close': """                    </tbody>
+                </table>
+            </div>
+""",
+    'final_header': """            <p>Comprehensive Academic Performance Review</p>
+            <p style="font-size: 0.9em; color: #95a5a6;">Generated on $generated</p>
+""",
+    'final_footer': """
+        <div class="section">
+            <h2>💡 Strategic Recommendations</h2>
+            <div class="recommendations">
+                <ol>
+                    <li><strong>📚 Subject-Specific Tutoring:</strong> Focus additional resources on commonly struggling subjects, particularly Mathematics and English</li>
+                    <li><strong>📈 Progress Monitoring:</strong> Implement weekly progress reviews for Year 13 students approaching final examinations</li>
+                    <li><strong>🤝 Peer Mentoring:</strong> Establish partnerships between high-achieving and struggling students</li>
+                    <li><strong>👨‍👩‍👧‍👦 Parent Engagement:</strong> Schedule urgent meetings with parents of priority students</li>
+                    <li><strong>📊 Data-Driven Decisions:</strong> Use this analysis to allocate teaching resources and plan intervention strategies</li>
+                </ol>
+            </div>
+        </div>
+        
+        <div style="text-align: center; margin-top: 40px; padding: 20px; background-color: #f8f9fa; border-radius: 10px;">
+            <p style="color: #6c757d; margin: 0;">
+                <strong>Report Generated:</strong> $generated | 
+                <strong>Total Students Analyzed:</strong> $students | 
+                <strong>Subjects Tracked:</strong> $subjects
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+""",
+    'shard_header': """            <p>$title</p>
+            <p style="font-size: 0.9em; color: #95a5a6;">Generated on $generated</p>
+""",
+    'pagination': """
+        <nav class="pagination">
+            <a href="$index">🏠 Overview</a>
+$links        </nav>
+""",
+    'page_link': """            <a href="$href">$label</a>
+""",
+    'current_page': """            <span class="current">$label</span>
+""",
+    'shard_table_open': """            <table class="grades-table">
+                <thead>
+                    <tr>
+                        <th>School</th>
+                        <th>Year</th>
+                        <th>Students</th>
+                        <th>Exceeding</th>
+                        <th>Below</th>
+                        <th>Pages</th>
+                    </tr>
+                </thead>
+                <tbody>
+""",
+    'shard_row': """                    <tr>
+                        <td><a href="$href"><strong>$school</strong></a></td>
+                        <td>$year</td>
+                        <td>$students</td>
+                        <td>$exceeding</td>
+                        <td>$below</td>
+                        <td>$pages</td>
+                    </tr>
+""",
+    'shard_table_close': """                </tbody>
+            </table>
+""",
+    'page_close': """    </div>
+</body>
+</html>
+""",
+    'virtual_list': """
+        <div class="section">
+            <h2>📊 Complete Student Overview</h2>
+            <div class="report-controls">
+                <input type="search" id="student-search" placeholder="🔍 Search name, school, year or subject">
+                <select id="school-filter">
+                    <option value="">All schools</option>
+                </select>
+                <select id="priority-filter">
+                    <option value="">All priorities</option>
+                    <option value="high">High priority</option>
+                    <option value="medium">Medium priority</option>
+                    <option value="low">Low priority</option>
+                </select>
+                <select id="sort-order">
+                    <option value="name">Sort by name</option>
+                    <option value="below">Most below target</option>
+                    <option value="exceeding">Most exceeding target</option>
+                    <option value="school">Sort by school</option>
+                </select>
+                <span class="visible-count" id="visible-count"></span>
+            </div>
+            <div class="student-spacer" id="student-spacer"></div>
+        </div>
+$data_script        <script>
+(function () {
+    var data = window.REPORT_DATA || JSON.parse(document.getElementById('report-data').textContent);
+    var CARD_BASE = 175, ROW = 46, GAP = 25, OVERSCAN = 600;
+    var spacer = document.getElementById('student-spacer');
+    var search = document.getElementById('student-search');
+    var schoolFilter = document.getElementById('school-filter');
+    var priorityFilter = document.getElementById('priority-filter');
+    var sortOrder = document.getElementById('sort-order');
+    var visibleCount = document.getElementById('visible-count');
+    var view = [], offsets = [0], shown = '';
+
+    function escapeHtml(text) {
+        return String(text).replace(/[&<>"]/g, function (c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+        });
+    }
+
+    function byName(a, b) {
+        return a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : 0;
+    }
+
+    function cardHtml(student, top) {
+        var rows = student[7].map(function (grade) {
+            var status = data.statuses[grade[3]];
+            return '<tr><td><strong>' + escapeHtml(grade[0]) + '</strong></td><td>' + escapeHtml(grade[1]) +
+                '</td><td>' + escapeHtml(grade[2]) + '</td><td class="status-' + status[1] + '">' +
+                status[2] + ' ' + status[0] + '</td></tr>';
+        }).join('');
+        return '<div class="student-card virtual-card priority-' + student[3] + '" style="top: ' + top +
+            'px; height: ' + (CARD_BASE + student[7].length * ROW) + 'px">' +
+            '<div class="student-header"><div class="student-name">👤 ' + escapeHtml(student[0]) + '</div>' +
+            '<div class="student-info">🏫 ' + escapeHtml(student[1]) + ' | 📅 ' + escapeHtml(student[2]) + '</div></div>' +
+            '<table class="grades-table"><thead><tr><th>Subject</th><th>Current Grade</th><th>Target Grade</th>' +
+            '<th>Status</th></tr></thead><tbody>' + rows + '</tbody></table></div>';
+    }
+
+    function firstAtOrBelow(position) {
+        var low = 0, high = view.length;
+        while (low < high) {
+            var middle = (low + high) >> 1;
+            if (offsets[middle + 1] <= position) { low = middle + 1; } else { high = middle; }
+        }
+        return low;
+    }
+
+    function render(force) {
+        var top = -spacer.getBoundingClientRect().top;
+        var first = firstAtOrBelow(top - OVERSCAN);
+        var last = firstAtOrBelow(top + window.innerHeight + OVERSCAN);
+        var key = first + ':' + last;
+        if (!force && key === shown) { return; }
+        shown = key;
+        var html = [];
+        for (var i = first; i <= last && i < view.length; i++) {
+            html.push(cardHtml(view[i], offsets[i]));
+        }
+        spacer.innerHTML = html.join('');
+    }
+
+    function applyFilters() {
+        var term = search.value.trim().toLowerCase();
+        var school = schoolFilter.value, priority = priorityFilter.value;
+        view = data.students.filter(function (s) {
+            if (school && s[1] !== school) { return false; }
+            if (priority && s[3] !== priority) { return false; }
+            if (!term) { return true; }
+            if ((s[0] + ' ' + s[1] + ' ' + s[2]).toLowerCase().indexOf(term) !== -1) { return true; }
+            return s[7].some(function (grade) { return grade[0].toLowerCase().indexOf(term) !== -1; });
+        });
+        var order = sortOrder.value;
+        if (order === 'below') { view.sort(function (a, b) { return b[6] - a[6] || byName(a, b); }); }
+        else if (order === 'exceeding') { view.sort(function (a, b) { return b[4] - a[4] || byName(a, b); }); }
+        else if (order === 'school') { view.sort(function (a, b) { return a[1] < b[1] ? -1 : a[1] > b[1] ? 1 : byName(a, b); }); }
+        else { view.sort(byName); }
+
+        offsets = [0];
+        for (var i = 0; i < view.length; i++) {
+            offsets.push(offsets[i] + CARD_BASE + view[i][7].length * ROW + GAP);
+        }
+        spacer.style.height = offsets[view.length] + 'px';
+        visibleCount.textContent = view.length + ' of ' + data.students.length + ' students';
+        render(true);
+    }
+
+    var schools = {};
+    data.students.forEach(function (s) { schools[s[1]] = true; });
+    Object.keys(schools).sort().forEach(function (school) {
+        var option = document.createElement('option');
+        option.value = option.textContent = school;
+        schoolFilter.appendChild(option);
+    });
+
+    [search, schoolFilter, priorityFilter, sortOrder].forEach(function (control) {
+        control.addEventListener('input', applyFilters);
+    });
+    window.addEventListener('scroll', function () { render(false); }, {passive: true});
+    window.addEventListener('resize', function () { render(true); });
+    applyFilters();
+})();
+        </script>
+""",
+    'search_box': """
+        <div class="section report-search">
+            <h2>🔍 Search</h2>
+            <input type="search" id="report-search" placeholder="Search students, schools, years, subjects or statuses (e.g. below maths)">
+            <div class="search-summary" id="search-summary"></div>
+            <div id="search-results"></div>
+        </div>
+        <script src="$src"></script>
+        <script>
+(function () {
+    var index = window.SEARCH_INDEX, MAX_RESULTS = 100;
+    var input = document.getElementById('report-search');
+    var summary = document.getElementById('search-summary');
+    var results = document.getElementById('search-results');
+    if (!index) { input.disabled = true; return; }
+
+    function tokenize(text) {
+        return String(text).toLowerCase().match(/[a-z0-9]+/g) || [];
+    }
+
+    function escapeHtml(text) {
+        return String(text).replace(/[&<>"]/g, function (c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+        });
+    }
+
+    function matchingDocs(queryWord) {
+        var matches = {};
+        var ids = index.prefixes[queryWord.slice(0, index.prefix_length)] || [];
+        ids.forEach(function (i) {
+            if (index.words[i].indexOf(queryWord) !== 0) { return; }
+            index.word_docs[i].forEach(function (docId) { matches[docId] = true; });
+            index.word_students[i].forEach(function (studentId) {
+                var next = index.students[studentId + 1];
+                var end = next ? next[4] : index.docs.length;
+                for (var docId = index.students[studentId][4]; docId < end; docId++) { matches[docId] = true; }
+            });
+        });
+        return matches;
+    }
+
+    function search(query) {
+        var matches = null;
+        var words = tokenize(query);
+        for (var w = 0; w < words.length; w++) {
+            var found = matchingDocs(words[w]);
+            if (matches === null) {
+                matches = found;
+            } else {
+                for (var docId in matches) {
+                    if (!found[docId]) { delete matches[docId]; }
+                }
+            }
+        }
+        return Object.keys(matches || {}).map(Number).sort(function (a, b) { return a - b; });
+    }
+
+    input.addEventListener('input', function () {
+        var query = input.value.trim();
+        if (!query) {
+            summary.textContent = '';
+            results.innerHTML = '';
+            return;
+        }
+        var matches = search(query);
+        summary.textContent = matches.length + ' matching grade' + (matches.length === 1 ? '' : 's') +
+            (matches.length > MAX_RESULTS ? ' (showing the first ' + MAX_RESULTS + ')' : '');
+        if (!matches.length) {
+            results.innerHTML = '';
+            return;
+        }
+        var rows = matches.slice(0, MAX_RESULTS).map(function (docId) {
+            var doc = index.docs[docId], student = index.students[doc[0]];
+            return '<tr><td><strong>' + escapeHtml(student[0]) + '</strong></td><td>' + escapeHtml(student[1]) +
+                '</td><td>' + escapeHtml(student[2]) + '</td><td>' + escapeHtml(doc[1]) + '</td><td>' +
+                escapeHtml(doc[2]) + '</td><td>' + escapeHtml(doc[3]) + '</td><td>' +
+                escapeHtml(index.statuses[doc[4]]) + '</td></tr>';
+        });
+        results.innerHTML = '<table class="grades-table"><thead><tr><th>Student</th><th>School</th><th>Year</th>' +
+            '<th>Subject</th><th>Current Grade</th><th>Target Grade</th><th>Status</th></tr></thead><tbody>' +
+            rows.join('') + '</tbody></table>';
+    });
+})();
+        </script>
+""",
+    'json_island': """        <script type="application/json" id="report-data">$payload</script>
+""",
+    'sidecar_script': """        <script src="$src"></script>
+""",
+    'shareable_header': """            <p>Generated on $generated</p>
+""",
+    'shareable_footer': """
+        <div class="section">
+            <h2>💡 Recommendations</h2>
+            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px;">
+                <ol style="line-height: 1.8;">
+                    <li><strong>🎯 Priority Interventions:</strong> Focus immediate support on students with multiple subjects below target</li>
+                    <li><strong>📚 Subject-Specific Support:</strong> Provide additional tutoring in commonly struggling subjects (especially Maths)</li>
+                    <li><strong>🏆 Celebrate Success:</strong> Recognize and reward high-performing students to maintain motivation</li>
+                    <li><strong>📈 Regular Reviews:</strong> Implement weekly progress checks for Year 13 students approaching final exams</li>
+                    <li><strong>🤝 Peer Support:</strong> Establish mentoring partnerships between high performers and struggling students</li>
+                    <li><strong>👨‍👩‍👧‍👦 Parent Engagement:</strong> Schedule meetings with parents of students needing attention</li>
+                </ol>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+}
+
+# Every rule the final report variants (single page, sharded, search, virtualized) use,
+# for the shared external report.css. The shareable report's rules differ in body for
+# many of the same selectors, so it links its own shareable.css built from SHAREABLE_STYLESHEET.
+SHARED_STYLESHEET = FINAL_STYLESHEET + PAGINATION_STYLESHEET + SEARCH_STYLESHEET + VIRTUAL_STYLESHEET
+
+VIEWPORT_META = """    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+"""
+
+class CompiledTemplate:
+    """A template split once into literal text and field names"""
+    
+    def __init__(self, source: str):
+        self.chunks = []
+        position = 0
+        for match in string.Template.pattern.finditer(source):
+            self.chunks.append((source[position:match.start()], None))
+            if match.group('escaped') is not None:
+                self.chunks.append(('$', None))
+            else:
+                name = match.group('named') or match.group('braced')
+                if name is None:
+                    raise ValueError(f"Invalid template field at position {match.start()}")
+                self.chunks.append(('', name))
+            position = match.end()
+        self.chunks.append((source[position:], None))
+        
+        # Merge adjacent literals so rendering touches as few pieces as possible
+        merged = []
+        for text, field in self.chunks:
+            if field is None and merged and merged[-1][1] is None:
+                merged[-1] = (merged[-1][0] + text, None)
+            elif text or field is not None:
+                merged.append((text, field))
+        self.chunks = merged
+    
+    def write(self, write: Writer, values: Dict):
+        """Emit the template with its fields filled in"""
+        for text, field in self.chunks:
+            write(text if field is None else str(values[field]))
+    
+    def render(self, values: Dict) -> str:
+        """The filled-in template as one string"""
+        parts = []
+        self.write(parts.append, values)
+        return ''.join(parts)
+
+@lru_cache(maxsize=None)
+def template(name: str) -> CompiledTemplate:
+    """Compiled template by name, compiled on first use"""
+    return CompiledTemplate(TEMPLATES[name])
+
+def render_page_head(write: Writer, stylesheet: str, header: str, meta: str = '',
+                     stylesheet_href: Optional[str] = None):
+    """Document head, stylesheet (inline, or linked when stylesheet_href is given) and page title block"""
+    if stylesheet_href:
+        styles = template('stylesheet_link').render({'href': stylesheet_href})
+    else:
+        styles = template('inline_style').render({'stylesheet': stylesheet})
+    template('page_head').write(write, {'meta': meta, 'styles': styles, 'header': header})
+
+def render_summary_stats(write: Writer, stats: Iterable[Tuple[object, str]]):
+    """Row of headline stat cards from (value, label) pairs"""
+    card = template('stat_card')
+    cards = ''.join(card.render({'value': value, 'label': label}) for value, label in stats)
+    template('summary_stats').write(write, {'cards': cards})
+
+def render_section_open(write: Writer, heading: str, alert: Optional[Dict] = None):
+    """Section heading, with an optional alert box (alert_class, lead, message)"""
+    template('section_open').write(write, {'heading': heading})
+    if alert:
+        template('alert').write(write, alert)
+
+def render_section_close(write: Writer):
+    """Close a section opened with render_section_open"""
+    template('section_close').write(write, {})
+
+def render_student_card(write: Writer, student: Dict, icon: str = '👤', priority_class: Optional[str] = None,
+                        subjects: Optional[List[Dict]] = None, show_summary: bool = False,
+                        strong_subjects: bool = False):
+    """One student card with its grades table"""
+    summary = template('performance_summary').render(student) if show_summary else ''
+    template('student_card_open').write(write, {
+        'priority_class': priority_class or f"priority-{student['priority']}",
+        'icon': icon,
+        'name': student['name'],
+        'school': student['school'],
+        'year': student['year'],
+        'summary': summary
+    })
+    
+    row = template('grade_row')
+    for subject_info in student['subjects'] if subjects is None else subjects:
+        subject = f"<strong>{subject_info['subject']}</strong>" if strong_subjects else subject_info['subject']
+        row.write(write, {
+            'subject': subject,
+            'current': subject_info['current'],
+            'predicted': subject_info['predicted'],
+            'status_class': f"status-{subject_info['color'].replace('dark', '')}",
+            'icon': subject_info['icon'],
+            'status': subject_info['status']
+        })
+    
+    template('student_card_close').write(write, {})
+
+def render_pagination(write: Writer, pages: List[str], current: int, index: str = 'index.html'):
+    """Links to every page of a shard, with the current one highlighted"""
+    link = template('page_link')
+    here = template('current_page')
+    links = ''.join(
+        (here if number == current else link).render({'href': href, 'label': number + 1})
+        for number, href in enumerate(pages)
+    )
+    template('pagination').write(write, {'index': index, 'links': links})
\ No newline at end of file
@@ -0,0 +1,107 @@
+import json
+import re
+from typing import Dict, List, Set
+
+# Word prefixes up to this length are indexed; longer query words are looked
+# up by their first PREFIX_LENGTH characters and checked against the words found
+PREFIX_LENGTH = 6
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words of a field"""
+    return _TOKEN_RE.findall(str(text).lower())
+
+def build_search_index(students_analysis: List[Dict], prefix_length: int = PREFIX_LENGTH) -> Dict:
+    """Inverted index over student name, school, year, subject, grades and status"""
+    students = []
+    statuses = {}
+    docs = []
+    words = {}
+    word_students = []
+    word_docs = []
+    
+    def word_id(word: str) -> int:
+        if word not in words:
+            words[word] = len(words)
+            word_students.append([])
+            word_docs.append([])
+        return words[word]
+    
+    # Schools, years, subjects, grades and statuses repeat, so their words are looked up once
+    field_words = {}
+    def words_of(text: str) -> frozenset:
+        if text not in field_words:
+            field_words[text] = frozenset(word_id(word) for word in tokenize(text))
+        return field_words[text]
+    
+    # Documents are (student, subject) rows, so "below maths" finds exactly those rows.
+    # Name, school and year words post the student, whose rows are contiguous.
+    for student in students_analysis:
+        student_id = len(students)
+        students.append([str(student['name']), str(student['school']), str(student['year']),
+                         student['priority'], len(docs)])
+        
+        name_words = {word_id(word) for word in tokenize(student['name'])}
+        for word in name_words | words_of(str(student['school'])) | words_of(str(student['year'])):
+            word_students[word].append(student_id)
+        
+        for subject_info in student['subjects']:
+            subject = str(subject_info['subject'])
+            current = str(subject_info['current'])
+            predicted = str(subject_info['predicted'])
+            status_id = statuses.setdefault(subject_info['status'], len(statuses))
+            doc_id = len(docs)
+            docs.append([student_id, subject, current, predicted, status_id])
+            
+            for word in (words_of(subject) | words_of(subject_info['status'])
+                         | words_of(current) | words_of(predicted)):
+                word_docs[word].append(doc_id)
+    
+    prefixes = {}
+    for word, i in words.items():
+        for length in range(1, min(len(word), prefix_length) + 1):
+            prefixes.setdefault(word[:length], []).append(i)
+    
+    return {
+        'prefix_length': prefix_length,
+        'students': students,
+        'statuses': list(statuses),
+        'docs': docs,
+        'words': list(words),
+        'word_students': word_students,
+        'word_docs': word_docs,
+        'prefixes': prefixes
+    }
+
+def _matching_docs(index: Dict, query_word: str) -> Set[int]:
+    """Rows containing a word that starts with query_word"""
+    students = index['students']
+    doc_count = len(index['docs'])
+    matches = set()
+    
+    for i in index['prefixes'].get(query_word[:index['prefix_length']], []):
+        if not index['words'][i].startswith(query_word):
+            continue
+        matches.update(index['word_docs'][i])
+        for student_id in index['word_students'][i]:
+            end = students[student_id + 1][4] if student_id + 1 < len(students) else doc_count
+            matches.update(range(students[student_id][4], end))
+    
+    return matches
+
+def search(index: Dict, query: str) -> List[int]:
+    """Row IDs matching every word of the query as a word prefix, in report order"""
+    matches = None
+    for query_word in tokenize(query):
+        found = _matching_docs(index, query_word)
+        matches = found if matches is None else matches & found
+        if not matches:
+            return []
+    return sorted(matches or [])
+
+def write_search_index(index: Dict, path: str):
+    """Save the index as a script, so the report can load it when opened from disk"""
+    payload = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"window.SEARCH_INDEX = {payload};\n")
\ No newline at end of file
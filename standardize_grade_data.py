@@ -1,7 +1,8 @@
 import pandas as pd
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple, Union
 import json
+from tracker_loader import TRACKER_FILE, TRACKER_SHEET, as_tracker_rows, load_tracker_rows
 
 class GradeDataStandardizer:
     def __init__(self):
@@ -243,28 +244,27 @@ class GradeDataStandardizer:
         
         return grade.upper()
     
-    def process_student_data(self, df: pd.DataFrame) -> List[Dict]:
+    def process_student_data(self, rows: Union[pd.DataFrame, Iterable[Tuple]]) -> List[Dict]:
         """Process all student data and return standardized format"""
         standardized_data = []
         
-        for index, row in df.iterrows():
-            name = row['Full Name']
+        for name, school, year, raw_current, raw_predicted in as_tracker_rows(rows):
             if pd.isna(name) or name.strip() == '':
                 continue
             
             student_data = {
                 'name': name.strip(),
-                'school': str(row['School You Attend']).strip() if not pd.isna(row['School You Attend']) else "Unknown School",
-                'year': str(row['What year are you in']).strip() if not pd.isna(row['What year are you in']) else "Unknown Year",
+                'school': str(school).strip() if not pd.isna(school) else "Unknown School",
+                'year': str(year).strip() if not pd.isna(year) else "Unknown Year",
                 'subjects': {}
             }
             
             # Process current grades
-            current_text = self.clean_text(row['Please list all the subjects you are currently taking and your current grades'])
+            current_text = self.clean_text(raw_current)
             current_pairs = self.extract_subject_grade_pairs(current_text)
             
             # Process predicted grades
-            predicted_text = self.clean_text(row['Please list all your predicted grades for each subject'])
+            predicted_text = self.clean_text(raw_predicted)
             predicted_pairs = self.extract_subject_grade_pairs(predicted_text)
             
             # Combine all subjects
@@ -357,14 +357,14 @@ def main():
     """Main function to run standardization"""
     try:
         # Load data
-        df = pd.read_excel('KOC Grade Tracker Form(1-52).xlsx', sheet_name='Sheet1')
+        rows = load_tracker_rows(TRACKER_FILE, TRACKER_SHEET)
         
         # Initialize standardizer
         standardizer = GradeDataStandardizer()
         
         # Process data
         print("🔧 Starting grade data standardization...")
-        standardized_data = standardizer.process_student_data(df)
+        standardized_data = standardizer.process_student_data(rows)
         
         # Save standardized data
         standardizer.save_standardized_data(standardized_data)
@@ -0,0 +1,78 @@
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+
+# (start, end, keyword) of a keyword found in the text
+KeywordMatch = Tuple[int, int, str]
+
+class SubjectKeywordMatcher:
+    """Aho-Corasick automaton that finds every subject keyword in one pass"""
+    
+    def __init__(self, keywords: Iterable[str]):
+        # State 0 is the root; each state has its goto edges, failure link and outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword:
+                self._add(keyword)
+        self._link()
+    
+    def _add(self, keyword: str):
+        """Add one keyword to the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        if keyword not in self._output[state]:
+            self._output[state].append(keyword)
+    
+    def _link(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+    
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """All whole-word keyword occurrences in the text, in order of their end position"""
+        text = text.lower()
+        matches = []
+        state = 0
+        
+        for end, char in enumerate(text, 1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            
+            for keyword in self._output[state]:
+                start = end - len(keyword)
+                if _is_boundary(text, start - 1) and _is_boundary(text, end):
+                    matches.append((start, end, keyword))
+        
+        return matches
+    
+    def longest_match(self, text: str) -> Optional[KeywordMatch]:
+        """The longest whole-word keyword in the text; the leftmost wins a tie"""
+        best = None
+        for match in self.find_all(text):
+            if best is None or (match[1] - match[0], -match[0]) > (best[1] - best[0], -best[0]):
+                best = match
+        return best
+
+def _is_boundary(text: str, index: int) -> bool:
+    """True if index is outside the text or not a letter or digit"""
+    return index < 0 or index >= len(text) or not text[index].isalnum()
\ No newline at end of file
@@ -0,0 +1,21 @@
+from grade_scales import BELOW, DIFFERENT_SYSTEMS, EXCEEDING, MEETING, compare_grade_status
+from improved_grade_analysis import compare_grades
+
+def test_report_comparison_ranks_single_grades_across_scales():
+    """The main reports rank GCSE, A-Level and BTEC grades on raw points, and read 'D' as A-Level"""
+    assert compare_grade_status('7', 'A') == EXCEEDING
+    assert compare_grade_status('A', '9') == BELOW
+    assert compare_grade_status('D', 'M') == MEETING
+    assert compare_grade_status('DMM', 'MMM') == EXCEEDING
+    assert compare_grade_status('L2', 'B') == DIFFERENT_SYSTEMS
+
+def test_summary_comparison_stays_within_one_system():
+    """The summary script never ranks one system against another, and reads 'D' from the other grade"""
+    assert compare_grades('7', 'A') == "📊 Different Systems"
+    assert compare_grades('A', '9') == "📊 Different Systems"
+    assert compare_grades('D', 'M') == "🎉 Exceeding Target"
+    assert compare_grades('D', 'Merit') == "🎉 Exceeding Target"
+    assert compare_grades('D', 'B') == "⚠️ Below Target"
+    assert compare_grades('U', '4') == "⚠️ Below Target"
+    assert compare_grades('Listed', 'listed') == "✅ On Track"
+    assert compare_grades('N/A', 'A') == "🎯 Target Set"
\ No newline at end of file
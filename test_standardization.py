@@ -0,0 +1,38 @@
+import pandas as pd
+from improved_standardization import ImprovedGradeStandardizer
+from tracker_loader import TRACKER_COLUMNS
+
+def _tracker_frame(rows, index=None) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=list(TRACKER_COLUMNS), index=index)
+
+def test_duplicate_index_keeps_students_apart():
+    """Concatenated exports repeat index labels; each row must keep only its own subjects"""
+    rows = [
+        ('Ada', 'Kharis Academy', 'Year 12', 'Mathematics - A\nBiology - B', 'Mathematics - A*\nBiology - A'),
+        ('Ben', 'Kharis Academy', 'Year 12', 'Chemistry - C', 'Chemistry - B'),
+    ]
+    standardizer = ImprovedGradeStandardizer()
+    frame = standardizer.process_all_data(_tracker_frame(rows, index=[0, 0]))
+    streamed = standardizer.process_all_data(iter(rows))
+    
+    assert frame == streamed
+    assert list(frame[0]['subjects']) == ['Mathematics', 'Biology']
+    assert list(frame[1]['subjects']) == ['Chemistry']
+
+def test_qualified_spellings_of_one_course_agree():
+    """'BTEC Sport', 'Btec sport' and 'Double Btec sport' are one course and must not be counted twice"""
+    standardizer = ImprovedGradeStandardizer()
+    for base in ('sport', 'applied science'):
+        spellings = [base, f'btec {base}', f'BTEC {base.title()}', f'Double Btec {base}', f'level 3 btec {base}']
+        assert len({standardizer.standardize_subject(spelling) for spelling in spellings}) == 1, base
+
+def test_subject_mappings_are_read_only():
+    """The alias indexes are built once from the table, so it must not change underneath them"""
+    standardizer = ImprovedGradeStandardizer()
+    try:
+        standardizer.subject_mappings['new subject'] = 'New Subject'
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("subject_mappings accepted an update")
+    assert 'new subject' not in ImprovedGradeStandardizer().subject_mappings
\ No newline at end of file
@@ -0,0 +1,99 @@
+import pandas as pd
+import hashlib
+import os
+import pickle
+from atomic_files import atomic_write
+from typing import Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+TRACKER_FILE = 'KOC Grade Tracker Form(1-52).xlsx'
+TRACKER_SHEET = 'Sheet1'
+
+# Decoded rows are cached here, keyed by workbook content hash and sheet name
+CACHE_DIR = '.grade_cache'
+CACHE_VERSION = 1
+
+# The five form columns the standardizer and reports actually read
+NAME_COLUMN = 'Full Name'
+SCHOOL_COLUMN = 'School You Attend'
+YEAR_COLUMN = 'What year are you in'
+CURRENT_COLUMN = 'Please list all the subjects you are currently taking and your current grades'
+PREDICTED_COLUMN = 'Please list all your predicted grades for each subject'
+
+TRACKER_COLUMNS = (NAME_COLUMN, SCHOOL_COLUMN, YEAR_COLUMN, CURRENT_COLUMN, PREDICTED_COLUMN)
+
+class TrackerRow(NamedTuple):
+    """One form response, reduced to the columns we use"""
+    name: object
+    school: object
+    year: object
+    current: object
+    predicted: object
+
+def iter_tracker_rows(path: str = TRACKER_FILE, sheet_name: str = TRACKER_SHEET) -> Iterator[TrackerRow]:
+    """Stream tracker rows from the workbook in read-only mode"""
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        
+        positions = {str(title).strip(): i for i, title in enumerate(header) if title is not None}
+        missing = [column for column in TRACKER_COLUMNS if column not in positions]
+        if missing:
+            raise KeyError(f"Missing tracker columns in {path}: {missing}")
+        indices = [positions[column] for column in TRACKER_COLUMNS]
+        
+        for row in rows:
+            yield TrackerRow(*(row[i] if i < len(row) else None for i in indices))
+    finally:
+        workbook.close()
+
+def rows_from_dataframe(df: pd.DataFrame) -> Iterator[TrackerRow]:
+    """Adapt an already-loaded DataFrame to tracker row tuples"""
+    for values in df[list(TRACKER_COLUMNS)].itertuples(index=False, name=None):
+        yield TrackerRow(*values)
+
+def as_tracker_rows(source: Union[pd.DataFrame, Iterable[Tuple]]) -> Iterator[TrackerRow]:
+    """Accept either a DataFrame or an iterable of row tuples"""
+    if isinstance(source, pd.DataFrame):
+        return rows_from_dataframe(source)
+    return (row if isinstance(row, TrackerRow) else TrackerRow(*row) for row in source)
+
+def workbook_digest(path: str) -> str:
+    """SHA-256 of the workbook bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_path_for(path: str, sheet_name: str = TRACKER_SHEET, cache_dir: str = CACHE_DIR) -> str:
+    """Location of the cached rows for this workbook content and sheet"""
+    key = hashlib.sha256(f"{CACHE_VERSION}:{workbook_digest(path)}:{sheet_name}".encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{key}.pickle")
+
+def load_tracker_rows(path: str = TRACKER_FILE, sheet_name: str = TRACKER_SHEET,
+                      cache_dir: str = CACHE_DIR) -> List[TrackerRow]:
+    """Load tracker rows, decoding the workbook only when the cache is cold"""
+    cache_path = cache_path_for(path, sheet_name, cache_dir)
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            return [TrackerRow(*values) for values in pickle.load(f)]
+    except (OSError, pickle.UnpicklingError, EOFError, TypeError):
+        pass
+    
+    rows = list(iter_tracker_rows(path, sheet_name))
+    
+    # Written atomically so concurrent readers never see a partial cache
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with atomic_write(cache_path) as f:
+            pickle.dump([tuple(row) for row in rows], f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"Warning: could not write tracker cache: {e}")
+    
+    return rows
\ No newline at end of file